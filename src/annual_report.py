@@ -17,6 +17,7 @@
 
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Tuple, Any
 import re
@@ -40,6 +41,33 @@ except ImportError:
         KeywordNetwork = None
         NetworkConfig = None
 
+# 优先使用 orjson 解析 JSON，未安装时回退到标准库
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+# 并行读取 JSON 文件的线程数
+LOAD_WORKERS = 8
+
+
+def _load_json_file(json_file: Path) -> Any:
+    """
+    读取并解析单个 JSON 文件
+    
+    Args:
+        json_file: JSON 文件路径
+        
+    Returns:
+        解析后的数据，读取失败时返回 None
+    """
+    try:
+        return json_loads(json_file.read_bytes())
+    except Exception as e:
+        print(f"Error loading {json_file}: {e}")
+        return None
+
 
 def load_all_json_data(data_dir: str = "data") -> pd.DataFrame:
     """
@@ -57,27 +85,26 @@ def load_all_json_data(data_dir: str = "data") -> pd.DataFrame:
     if not data_path.exists():
         return pd.DataFrame()
     
-    for json_file in data_path.rglob("*.json"):
-        try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
-                # 处理不同的数据结构
-                if isinstance(data, list):
-                    for item in data:
-                        if isinstance(item, dict):
-                            # 检查是否是嵌套结构（包含 'data' 字段）
-                            if 'data' in item and isinstance(item['data'], list):
-                                all_data.extend(item['data'])
-                            else:
-                                all_data.append(item)
-                elif isinstance(data, dict):
-                    if 'data' in data and isinstance(data['data'], list):
-                        all_data.extend(data['data'])
+    # 文件读取与解析互相独立，使用线程池并行加载
+    json_files = list(data_path.rglob("*.json"))
+    with ThreadPoolExecutor(max_workers=LOAD_WORKERS) as executor:
+        datasets = list(executor.map(_load_json_file, json_files))
+    
+    for data in datasets:
+        # 处理不同的数据结构
+        if isinstance(data, list):
+            for item in data:
+                if isinstance(item, dict):
+                    # 检查是否是嵌套结构（包含 'data' 字段）
+                    if 'data' in item and isinstance(item['data'], list):
+                        all_data.extend(item['data'])
                     else:
-                        all_data.append(data)
-        except Exception as e:
-            print(f"Error loading {json_file}: {e}")
+                        all_data.append(item)
+        elif isinstance(data, dict):
+            if 'data' in data and isinstance(data['data'], list):
+                all_data.extend(data['data'])
+            else:
+                all_data.append(data)
     
     if not all_data:
         return pd.DataFrame()
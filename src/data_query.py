@@ -18,6 +18,10 @@
         heat_range=(1000, None)
     )
     query.save_results(results, "output/query_results.json")
+
+    # 需要做列式统计时，可直接获取 DataFrame
+    df = query.query_as_frame(date_range=("2025-01-01", "2025-01-31"))
+    df["heat"].mean()
 """
 
 import json
@@ -26,6 +30,20 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
 
+import pandas as pd
+
+# 列式查询结果的标准列
+RESULT_COLUMNS = [
+    "rank",
+    "title",
+    "category",
+    "heat",
+    "reads",
+    "discussions",
+    "originals",
+    "date",
+]
+
 
 class DataQuery:
     """
@@ -43,6 +61,7 @@ class DataQuery:
         query(): 执行多条件查询
         save_results(): 保存查询结果到文件
         query_to_file(): 执行查询并直接保存到文件
+        query_as_frame(): 执行查询并返回列式 DataFrame
     """
 
     def __init__(self, data_dir: Optional[str] = None):
@@ -157,6 +176,7 @@ class DataQuery:
         originals_range: Optional[Tuple[float, float]] = None,
         title_keywords: Optional[List[str]] = None,
         sort_by: Optional[str] = "heat_desc",
+        limit: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
         """
         执行多条件数据查询。
@@ -177,6 +197,7 @@ class DataQuery:
                     "discussions_desc" (讨论量降序), "discussions_asc" (讨论量升序),
                     "originals_desc" (原创量降序), "originals_asc" (原创量升序),
                     "title_asc" (标题升序), "title_desc" (标题降序)
+            limit: 最多返回的条数，None表示不限制
 
         返回：
             符合所有条件的数据项列表（按指定方式排序）
@@ -186,7 +207,7 @@ class DataQuery:
             2. 如果没有日期范围，从所有数据开始筛选
             3. 按顺序应用各个筛选条件
             4. 按指定方式排序结果
-            5. 返回最终结果
+            5. 按limit截取并返回最终结果
         """
         # 初始数据集
         if date_range:
@@ -231,6 +252,10 @@ class DataQuery:
         # 对结果进行排序
         sorted_items = self._sort_results(filtered_items, sort_by)
 
+        # 限制返回条数
+        if limit is not None:
+            sorted_items = sorted_items[:limit]
+
         return sorted_items
 
     def _filter_by_date_range(
@@ -499,6 +524,24 @@ class DataQuery:
         self.save_results(results, output_path)
         return results
 
+    def query_as_frame(self, **query_kwargs) -> pd.DataFrame:
+        """
+        执行查询并以列式 DataFrame 返回结果。
+
+        参数：
+            **query_kwargs: 传递给query()方法的查询参数
+
+        返回：
+            查询结果的 DataFrame，列为 RESULT_COLUMNS，行顺序与 query() 一致
+
+        内部逻辑：
+            1. 调用query()方法执行查询
+            2. 使用 DataFrame.from_records 按标准列一次性构建列式结果，
+               聚合统计（均值、去重计数等）可直接在列上完成
+        """
+        results = self.query(**query_kwargs)
+        return pd.DataFrame.from_records(results, columns=RESULT_COLUMNS)
+
 
 def main():
     """
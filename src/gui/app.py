@@ -1,17 +1,36 @@
+import codecs
+import copy
+import io
 import json
+import os
+import re
 import sys
-import threading
+import tempfile
 import time
+import traceback
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
 import streamlit as st
 
+# 优先使用 orjson 进行 JSON 编解码，未安装时回退到标准库
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # 兼容在不同工作目录下运行 Streamlit：确保项目根目录加入 sys.path
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 if str(PROJECT_ROOT) not in sys.path:
@@ -50,6 +69,18 @@ try:
 except ModuleNotFoundError:
     from data_query import DataQuery
 
+# 导入年度报告模块
+try:
+    from src.annual_report import generate_annual_report
+except ModuleNotFoundError:
+    from annual_report import generate_annual_report
+
+# 导入RandomHotToday模块
+try:
+    from src.random_hot_today import RandomHotToday
+except ModuleNotFoundError:
+    from random_hot_today import RandomHotToday
+
 # 设置页面布局为宽屏模式
 st.set_page_config(
     page_title="微博热搜数据分析系统",
@@ -58,6 +89,141 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
+# 局部重新运行：st.fragment 需要 Streamlit>=1.37，
+# 1.33-1.36 使用 experimental_fragment，更早的版本退化为整页重新运行
+fragment = getattr(st, "fragment", None) or getattr(
+    st, "experimental_fragment", lambda func: func
+)
+
+
+# -------- 数据编码 -------- #
+def json_loads_bytes(data: bytes) -> Any:
+    """解析 JSON 字节串"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps_bytes(obj: Any) -> bytes:
+    """序列化为带缩进的 UTF-8 JSON 字节串（保留中文字符）"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                obj,
+                option=orjson.OPT_INDENT_2
+                | orjson.OPT_NON_STR_KEYS
+                | orjson.OPT_SERIALIZE_NUMPY,
+            )
+        except TypeError:
+            # orjson 不支持的类型交给标准库处理
+            pass
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def json_hash_bytes(obj: Any) -> bytes:
+    """将数据紧凑序列化，用于判断内容是否变化"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, default=repr).encode("utf-8")
+
+
+def dataframe_to_csv_bytes(df: pd.DataFrame) -> bytes:
+    """将 DataFrame 编码为带 BOM 的 UTF-8 CSV 字节串"""
+    buffer = io.BytesIO()
+    df.to_csv(buffer, index=False, encoding="utf-8-sig", chunksize=10_000)
+    return buffer.getvalue()
+
+
+def arrow_table_to_csv_bytes(table: pa.Table) -> bytes:
+    """将 Arrow 表编码为带 BOM 的 UTF-8 CSV 字节串"""
+    buffer = io.BytesIO()
+    buffer.write(codecs.BOM_UTF8)
+    pa_csv.write_csv(table, buffer)
+    return buffer.getvalue()
+
+
+# -------- 输出目录扫描 -------- #
+# 打包时不再压缩的文件类型（本身已是压缩格式）
+PRECOMPRESSED_SUFFIXES = (".png", ".jpg", ".jpeg", ".zip")
+
+
+def scan_output_dir(
+    output_dir: Path,
+) -> Tuple[List[os.DirEntry], Optional[os.DirEntry], List[os.DirEntry]]:
+    """单次扫描分析输出目录，返回 (PNG 图表, 分析报告, 全部文件)"""
+    png_entries: List[os.DirEntry] = []
+    report_entry = None
+    file_entries: List[os.DirEntry] = []
+    with os.scandir(output_dir) as it:
+        for entry in it:
+            if not entry.is_file():
+                continue
+            file_entries.append(entry)
+            if entry.name.endswith(".png"):
+                png_entries.append(entry)
+            elif entry.name == "analysis_report.txt":
+                report_entry = entry
+    png_entries.sort(key=lambda e: e.name)
+    file_entries.sort(key=lambda e: e.name)
+    return png_entries, report_entry, file_entries
+
+
+def build_results_zip(entries: List[os.DirEntry]) -> str:
+    """将输出文件打包为临时 ZIP 文件并返回路径，调用方负责删除"""
+    # 写入临时文件而非内存缓冲区；图片本身已是压缩格式，直接存储，只压缩文本报告
+    with tempfile.NamedTemporaryFile(suffix=".zip", delete=False) as zip_tmp:
+        try:
+            with zipfile.ZipFile(zip_tmp, "w", compresslevel=1) as zip_file:
+                for entry in entries:
+                    compress_type = (
+                        zipfile.ZIP_STORED
+                        if entry.name.lower().endswith(PRECOMPRESSED_SUFFIXES)
+                        else zipfile.ZIP_DEFLATED
+                    )
+                    zip_file.write(
+                        entry.path, entry.name, compress_type=compress_type
+                    )
+        except BaseException:
+            # 打包失败时调用方拿不到路径，需在此删除临时文件
+            zip_tmp.close()
+            os.unlink(zip_tmp.name)
+            raise
+    return zip_tmp.name
+
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def read_file_bytes(path: str, mtime: float) -> bytes:
+    """读取文件字节，按路径和修改时间缓存，文件更新后自动失效"""
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def read_text_file(path: str) -> str:
+    """读取 UTF-8 文本文件"""
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+@st.cache_resource
+def get_io_executor() -> ThreadPoolExecutor:
+    """缓存后台 I/O 线程池，所有会话共用"""
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="gui-io")
+
+
+@st.cache_resource
+def get_analysis_executor() -> ThreadPoolExecutor:
+    """
+    缓存后台分析线程池，单线程执行以避免 matplotlib 并发绘图
+
+    注意：线程池由所有会话共用，已开始的分析任务不随提交它的会话结束而取消，
+    会继续运行直至完成并写入 output/<文件名> 目录（期间删除该目录会被重新创建）。
+    """
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="gui-analysis")
+
+
 # -------- 页面注册与路由（可扩展） -------- #
 PAGES = {}
 
@@ -83,17 +249,26 @@ def get_data_query():
     return DataQuery()
 
 
-@st.cache_data(ttl=300)  # 缓存5分钟
+@st.cache_data(ttl=300, show_spinner=False)  # 缓存5分钟
 def fetch_realtime_data(
     timeout: int = 30,
     max_retries: int = 3,
     delay: float = 1.0,
-    force_refresh: bool = False,
+    _force_refresh: bool = False,
 ):
-    """获取实时热搜数据，缓存5分钟"""
+    """获取实时热搜数据，缓存5分钟（仅按请求参数区分缓存）"""
     scraper = get_realtime_scraper(timeout, max_retries, delay)
     # 如果强制刷新，不使用缓存
-    return scraper.fetch_realtime_top50(use_cache=not force_refresh)
+    return scraper.fetch_realtime_top50(use_cache=not _force_refresh)
+
+
+@fragment
+def render_realtime_stats(ranks: List[Any]) -> None:
+    """统计按钮及统计信息，作为独立片段重新运行"""
+    if st.button("📊 显示统计", help="显示更多统计信息"):
+        st.subheader("数据统计")
+        st.write(f"**总条数**: {len(ranks)}")
+        st.write(f"**排名范围**: {min(ranks)} - {max(ranks)}")
 
 
 @register_page("实时热搜 Top50")
@@ -116,11 +291,14 @@ def page_realtime_hot():
         refresh_btn = st.button("🔄 刷新数据", help="强制刷新热搜数据（忽略缓存）")
 
     # 自动获取数据或在用户点击刷新时重新获取
-    if refresh_btn:
-        # 清空缓存并重新获取
-        st.cache_data.clear()
+    # 两次刷新间隔过短（如双击）时沿用上次结果，避免连续请求微博
+    now = time.monotonic()
+    if refresh_btn and now - st.session_state.get("last_refresh_ts", 0.0) > 2:
+        st.session_state["last_refresh_ts"] = now
+        # 只清除实时热搜的缓存，其他页面的缓存保持不变
+        fetch_realtime_data.clear()
         items: List[Dict[str, Any]] = fetch_realtime_data(
-            timeout, max_retries, delay, force_refresh=True
+            timeout, max_retries, delay, _force_refresh=True
         )
     else:
         # 首次加载或显示缓存数据
@@ -131,7 +309,7 @@ def page_realtime_hot():
             st.info("⏳ 正在获取实时热搜数据，请稍候…")
 
         # 后台获取数据
-        items = fetch_realtime_data(timeout, max_retries, delay, force_refresh=False)
+        items = fetch_realtime_data(timeout, max_retries, delay)
         placeholder.empty()
 
     if not items:
@@ -148,40 +326,43 @@ def page_realtime_hot():
         return
 
     # 获取时间戳
-    from datetime import datetime
-
     current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
     st.success(f"✅ 成功获取 {len(items)} 条热搜 (更新时间: {current_time})")
 
-    # 展示表格
-    df = pd.DataFrame(items)
-    display_cols = ["rank", "title"]
-
-    # 使用HTML表格实现美化
-    html_table = "<table style='width:100%; border-collapse: collapse;'>"
-    html_table += "<thead><tr style='background-color: #f0f0f0;'>"
-    html_table += "<th style='text-align:center; padding:10px; border-bottom:2px solid #ddd; font-weight:bold;'>排名</th>"
-    html_table += "<th style='text-align:left; padding:10px; border-bottom:2px solid #ddd; font-weight:bold;'>热搜标题</th>"
-    html_table += "</tr></thead><tbody>"
-
-    for idx, (_, row) in enumerate(df[display_cols].iterrows()):
-        # 交替行颜色
-        bg_color = "#fafafa" if idx % 2 == 0 else "white"
-        html_table += f"<tr style='background-color: {bg_color};'>"
-        html_table += f"<td style='text-align:center; padding:8px; border-bottom:1px solid #eee; font-weight:bold;'>{row['rank']}</td>"
-        html_table += f"<td style='text-align:left; padding:8px; border-bottom:1px solid #eee;'>{row['title']}</td>"
-        html_table += "</tr>"
+    # 展示表格：50 条数据直接取出两列构建 Arrow 表，无需 pandas DataFrame
+    ranks = [item.get("rank") for item in items]
+    titles = [item.get("title") for item in items]
+    table = pa.table({"rank": ranks, "title": titles})
+
+    # 使用 st.dataframe 展示（前端按 Arrow 列式数据渲染，无需在服务端拼接 HTML），
+    # 高度按行数设置以完整展示全部条目
+    st.dataframe(
+        table,
+        hide_index=True,
+        use_container_width=True,
+        height=(len(items) + 1) * 35 + 3,
+        column_config={
+            "rank": st.column_config.NumberColumn("排名", width="small"),
+            "title": st.column_config.TextColumn("热搜标题"),
+        },
+    )
 
-    html_table += "</tbody></table>"
-    st.markdown(html_table, unsafe_allow_html=True)
+    # 导出内容按数据内容存入 session_state，数据未变化时重新运行无需再次编码
+    exports_key = json_hash_bytes(items)
+    if st.session_state.get("realtime_exports_key") != exports_key:
+        st.session_state.realtime_exports = (
+            json_dumps_bytes(items),
+            arrow_table_to_csv_bytes(table),
+        )
+        st.session_state.realtime_exports_key = exports_key
+    json_bytes, csv_bytes = st.session_state.realtime_exports
 
     # 分列显示下载和其他选项
     col1, col2, col3 = st.columns(3)
 
     with col1:
         # 下载 JSON
-        json_bytes = json.dumps(items, ensure_ascii=False, indent=2).encode("utf-8")
         st.download_button(
             label="📥 下载为 JSON",
             data=json_bytes,
@@ -191,9 +372,6 @@ def page_realtime_hot():
 
     with col2:
         # 下载为 CSV
-        csv_bytes = (
-            df[display_cols].to_csv(index=False, encoding="utf-8-sig").encode("utf-8")
-        )
         st.download_button(
             label="📥 下载为 CSV",
             data=csv_bytes,
@@ -202,14 +380,56 @@ def page_realtime_hot():
         )
 
     with col3:
-        # 显示统计信息
-        if st.button("📊 显示统计", help="显示更多统计信息"):
-            st.subheader("数据统计")
-            st.write(f"**总条数**: {len(items)}")
-            st.write(f"**排名范围**: {df['rank'].min()} - {df['rank'].max()}")
+        # 显示统计信息（点击时只重新运行统计片段）
+        render_realtime_stats(ranks)
 
 
 # -------- 单日数据分析页面 -------- #
+def latest_dir_mtime(root: str) -> float:
+    """返回目录及其直接子目录中最新的修改时间，用作目录扫描结果的缓存键"""
+    latest = os.stat(root).st_mtime
+    with os.scandir(root) as it:
+        for entry in it:
+            if entry.is_dir():
+                latest = max(latest, entry.stat().st_mtime)
+    return latest
+
+
+@st.cache_data(ttl=3600, max_entries=8)
+def list_available_dates(
+    data_dir: str = "data_processed", mtime: float = 0.0
+) -> List[Tuple[str, str]]:
+    """扫描已处理数据目录，返回 (日期, 文件路径) 列表，目录内容变化后缓存失效"""
+    available_dates = []
+
+    with os.scandir(data_dir) as it:
+        year_dirs = sorted(
+            entry.path
+            for entry in it
+            if entry.name.startswith("202") and entry.is_dir()
+        )
+
+    for year_dir in year_dirs:
+        with os.scandir(year_dir) as it:
+            json_files = sorted(
+                (entry.name, entry.path)
+                for entry in it
+                if entry.name.endswith(".json") and entry.is_file()
+            )
+        for name, path in json_files:
+            available_dates.append((name[: -len(".json")], path))
+
+    return available_dates
+
+
+def run_daily_analysis(json_path: str) -> str:
+    """对单日数据运行 json_analyzer 并返回输出日志（会写入图表和报告，因此不缓存）"""
+    f = io.StringIO()
+    with redirect_stdout(f):
+        analyze_json(json_path)
+    return f.getvalue()
+
+
 @register_page("单日热搜数据可视化")
 def page_daily_analysis():
     st.title("单日热搜数据可视化")
@@ -217,16 +437,15 @@ def page_daily_analysis():
     # 选择日期
     data_processed_dir = Path("data_processed")
 
-    if not data_processed_dir.exists():
+    # 只检查各级目录的修改时间，目录内容未变化时直接复用上次的扫描结果
+    try:
+        data_mtime = latest_dir_mtime(str(data_processed_dir))
+    except FileNotFoundError:
         st.error("data_processed 目录不存在")
         return
 
     # 获取所有可用的日期
-    available_dates = []
-    for year_folder in sorted(data_processed_dir.glob("202*")):
-        for json_file in sorted(year_folder.glob("*.json")):
-            date_str = json_file.stem
-            available_dates.append((date_str, str(json_file)))
+    available_dates = list_available_dates(str(data_processed_dir), data_mtime)
 
     if not available_dates:
         st.error("没有可用的数据文件")
@@ -248,19 +467,15 @@ def page_daily_analysis():
         if st.button("🔃 刷新", help="刷新页面"):
             st.rerun()
 
+    # 构造输出目录路径
+    output_dir = Path("output") / selected_date
+
     # 当点击生成分析按钮时
     if analysis_button:
         with st.spinner("正在生成分析..."):
             try:
-                import io
-                from contextlib import redirect_stdout
-
                 # 捕获 analyze_json 的输出
-                f = io.StringIO()
-                with redirect_stdout(f):
-                    analyze_json(json_path)
-
-                output_log = f.getvalue()
+                output_log = run_daily_analysis(json_path)
                 st.success("✅ 分析完成！")
 
                 # 显示输出日志
@@ -269,24 +484,18 @@ def page_daily_analysis():
 
             except Exception as e:
                 st.error(f"分析失败: {str(e)}")
-                import traceback
-
                 st.error(traceback.format_exc())
                 return
 
     # 显示生成的分析结果
-    from datetime import datetime
-
-    # 构造输出目录路径
     date_obj = datetime.strptime(selected_date, "%Y-%m-%d")
-    output_dir = Path("output") / selected_date
 
     if not output_dir.exists():
         st.info("👉 请先点击 '🔄 生成分析' 按钮来生成分析结果")
         return
 
-    # 查找所有生成的 PNG 图表
-    chart_files = sorted(output_dir.glob("*.png"))
+    # 单次扫描输出目录，得到所有 PNG 图表和分析报告
+    chart_files, report_file, _ = scan_output_dir(output_dir)
 
     if not chart_files:
         st.warning("没有生成的图表")
@@ -299,66 +508,153 @@ def page_daily_analysis():
     if len(chart_files) > 0:
         tabs = st.tabs(
             [
-                f.stem.replace(f"{selected_date}_", "").replace("_", " ")
+                f.name[: -len(".png")]
+                .replace(f"{selected_date}_", "")
+                .replace("_", " ")
                 for f in chart_files
             ]
         )
 
         for tab, chart_file in zip(tabs, chart_files):
             with tab:
-                # 直接使用文件路径显示图片，避免字节流解码问题
-                st.image(
-                    str(chart_file), use_column_width=True, caption=chart_file.name
-                )
-
-                # 提供下载按钮（读取字节供下载）
+                # 图片只读取一次，同时用于显示和下载（按路径和修改时间缓存）
                 try:
-                    with open(chart_file, "rb") as f:
-                        image_data = f.read()
-                    st.download_button(
-                        f"📥 下载 {chart_file.name}",
-                        data=image_data,
-                        file_name=chart_file.name,
-                        mime="image/png",
+                    image_data = read_file_bytes(
+                        chart_file.path, chart_file.stat().st_mtime
                     )
-                except Exception as e:
-                    st.warning(f"无法提供下载：{e}")
+                except OSError as e:
+                    st.warning(f"无法读取图表：{e}")
+                    continue
+
+                st.image(image_data, use_column_width=True, caption=chart_file.name)
+                st.download_button(
+                    f"📥 下载 {chart_file.name}",
+                    data=image_data,
+                    file_name=chart_file.name,
+                    mime="image/png",
+                )
 
     # 显示分析报告
-    report_file = output_dir / "analysis_report.txt"
-    if report_file.exists():
+    if report_file is not None:
         st.markdown("### 📄 分析报告")
-        with open(report_file, "r", encoding="utf-8") as f:
-            report_content = f.read()
+        report_bytes = read_file_bytes(report_file.path, report_file.stat().st_mtime)
 
         with st.expander("展开查看完整报告"):
-            st.text(report_content)
+            st.text(report_bytes.decode("utf-8"))
 
         # 提供报告下载
         st.download_button(
             "📥 下载分析报告",
-            data=report_content.encode("utf-8"),
+            data=report_bytes,
             file_name=f"{selected_date}_analysis_report.txt",
             mime="text/plain",
         )
 
 
+# -------- 图表缓存 -------- #
+@st.cache_resource
+def build_bar_figure(
+    items: tuple,
+    title: str,
+    color_scale: str,
+    x_label: str = "",
+    y_label: str = "",
+) -> go.Figure:
+    """根据 (标签, 数值) 元组构建水平条形图，相同输入直接复用缓存的图表对象"""
+    labels = [label for label, _ in items]
+    values = [value for _, value in items]
+
+    fig = px.bar(
+        x=values,
+        y=labels,
+        orientation="h",
+        title=title,
+        labels={"x": x_label or "x", "y": y_label or "y"},
+        color=values,
+        color_continuous_scale=color_scale,
+    )
+    fig.update_yaxes(automargin=True)
+    return fig
+
+
+@st.cache_resource
+def build_top_titles_figure(items: tuple) -> go.Figure:
+    """根据 (标题, 热度) 元组构建年度热度排名柱状图"""
+    heats = [heat for _, heat in items]
+
+    fig = px.bar(
+        x=list(range(1, len(items) + 1)),
+        y=heats,
+        labels={"x": "排名", "y": "热度值"},
+        title="热度排名前10的热搜",
+        color=heats,
+        color_continuous_scale="Reds",
+        text=[title[:20] for title, _ in items],
+    )
+    fig.update_traces(textposition="outside")
+    return fig
+
+
 # -------- 关键词共现网络页面 -------- #
+NETWORK_DATA_DIR = Path("output/word_networks/data")
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def load_keyword_network(year: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """加载指定年份的节点和边数据并按频次/共现度降序排列，按年份缓存"""
+    nodes_path = NETWORK_DATA_DIR / f"nodes_{year}.json"
+    edges_path = NETWORK_DATA_DIR / f"edges_{year}.json"
+    nodes_df = (
+        pd.DataFrame.from_records(
+            json_loads_bytes(nodes_path.read_bytes()),
+            columns=["keyword", "frequency"],
+        )
+        .astype({"frequency": "int32"})
+        .sort_values("frequency", ascending=False, kind="stable")
+    )
+    edges_df = (
+        pd.DataFrame.from_records(
+            json_loads_bytes(edges_path.read_bytes()),
+            columns=["source", "target", "weight"],
+        )
+        .astype({"weight": "int32"})
+        .sort_values("weight", ascending=False, kind="stable")
+    )
+    return nodes_df, edges_df
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def load_keyword_network_csv(year: str) -> Tuple[bytes, bytes]:
+    """生成指定年份节点和边数据的 CSV 下载内容，按年份缓存"""
+    nodes_df, edges_df = load_keyword_network(year)
+    return dataframe_to_csv_bytes(nodes_df), dataframe_to_csv_bytes(edges_df)
+
+
+@st.cache_data(ttl=3600, max_entries=8)
+def list_keyword_network_years(data_dir: str, mtime: float) -> List[str]:
+    """列出已生成网络数据的年份，目录内容变化后缓存失效"""
+    with os.scandir(data_dir) as it:
+        return sorted(
+            entry.name[len("nodes_") : -len(".json")]
+            for entry in it
+            if entry.name.startswith("nodes_") and entry.name.endswith(".json")
+        )
+
+
 @register_page("年度关键词网络图")
 def page_keyword_network():
     st.title("年度关键词网络图")
 
-    network_data_dir = Path("output/word_networks/data")
-
-    if not network_data_dir.exists():
+    # 获取可用的网络数据（按目录修改时间缓存扫描结果）
+    try:
+        network_mtime = NETWORK_DATA_DIR.stat().st_mtime
+    except FileNotFoundError:
         st.error("网络数据目录不存在，请先运行 word_network.py")
         return
 
-    # 获取可用的网络数据
-    available_networks = []
-    for json_file in sorted(network_data_dir.glob("nodes_*.json")):
-        year = json_file.stem.replace("nodes_", "")
-        available_networks.append(year)
+    available_networks = list_keyword_network_years(
+        str(NETWORK_DATA_DIR), network_mtime
+    )
 
     if not available_networks:
         st.error("没有可用的网络数据")
@@ -373,19 +669,14 @@ def page_keyword_network():
 
     with col2:
         if st.button("🔄 刷新", help="重新加载数据"):
+            list_keyword_network_years.clear()
+            load_keyword_network.clear()
+            load_keyword_network_csv.clear()
             st.rerun()
 
-    # 加载节点和边数据
+    # 加载节点和边数据（切换标签页等重新运行时直接命中缓存）
     try:
-        with open(
-            network_data_dir / f"nodes_{selected_year}.json", "r", encoding="utf-8"
-        ) as f:
-            nodes_data = json.load(f)
-
-        with open(
-            network_data_dir / f"edges_{selected_year}.json", "r", encoding="utf-8"
-        ) as f:
-            edges_data = json.load(f)
+        nodes_df, edges_df = load_keyword_network(selected_year)
     except Exception as e:
         st.error(f"加载失败: {e}")
         return
@@ -401,24 +692,27 @@ def page_keyword_network():
             Path("output/word_networks/figures")
             / f"keyword_network_{selected_year}.png"
         )
-        if network_img_path.exists():
-            st.image(str(network_img_path), use_column_width=True)
-
-            with open(network_img_path, "rb") as f:
-                st.download_button(
-                    "📥 下载网络图",
-                    f.read(),
-                    f"keyword_network_{selected_year}.png",
-                    "image/png",
-                )
-        else:
+        # 图片只读取一次，同时用于显示和下载（按路径和修改时间缓存）
+        try:
+            image_data = read_file_bytes(
+                str(network_img_path), network_img_path.stat().st_mtime
+            )
+        except FileNotFoundError:
             st.warning("网络图文件不存在")
+        else:
+            st.image(image_data, use_column_width=True)
+            st.download_button(
+                "📥 下载网络图",
+                image_data,
+                f"keyword_network_{selected_year}.png",
+                "image/png",
+            )
 
     with tab2:
         st.subheader("网络统计")
 
-        nodes_count = len(nodes_data)
-        edges_count = len(edges_data)
+        nodes_count = len(nodes_df)
+        edges_count = len(edges_df)
 
         col1, col2, col3, col4 = st.columns(4)
 
@@ -430,76 +724,63 @@ def page_keyword_network():
 
         with col3:
             if edges_count > 0:
-                avg_cooccur = np.mean([e["weight"] for e in edges_data])
+                avg_cooccur = edges_df["weight"].mean()
                 st.metric("平均共现度", f"{avg_cooccur:.2f}")
             else:
                 st.metric("平均共现度", "0")
 
         with col4:
             if nodes_count > 0:
-                avg_freq = np.mean([n["frequency"] for n in nodes_data])
+                avg_freq = nodes_df["frequency"].mean()
                 st.metric("平均关键词频次", f"{avg_freq:.2f}")
             else:
                 st.metric("平均关键词频次", "0")
 
-        # 频次TOP 10
-        import plotly.express as px
+        # 频次TOP 10（数据已按频次降序排列）
+        top_nodes = nodes_df.head(10)
 
-        top_nodes = sorted(nodes_data, key=lambda x: x["frequency"], reverse=True)[:10]
-
-        fig = px.bar(
-            x=[n["frequency"] for n in top_nodes],
-            y=[n["keyword"] for n in top_nodes],
-            orientation="h",
-            title="关键词频次 Top 10",
-            color=[n["frequency"] for n in top_nodes],
-            color_continuous_scale="Viridis",
+        fig = build_bar_figure(
+            tuple(zip(top_nodes["keyword"], top_nodes["frequency"].tolist())),
+            "关键词频次 Top 10",
+            "Viridis",
         )
-        fig.update_yaxes(automargin=True)
         st.plotly_chart(fig, use_container_width=True)
 
-        # 共现度最高的关系
-        top_edges = sorted(edges_data, key=lambda x: x["weight"], reverse=True)[:10]
-
-        edge_labels = [f"{e['source']} - {e['target']}" for e in top_edges]
-        edge_weights = [e["weight"] for e in top_edges]
+        # 共现度最高的关系（数据已按共现度降序排列）
+        top_edges = edges_df.head(10)
 
-        fig = px.bar(
-            x=edge_weights,
-            y=edge_labels,
-            orientation="h",
-            title="共现关系 Top 10",
-            color=edge_weights,
-            color_continuous_scale="Reds",
+        fig = build_bar_figure(
+            tuple(
+                zip(
+                    top_edges["source"] + " - " + top_edges["target"],
+                    top_edges["weight"].tolist(),
+                )
+            ),
+            "共现关系 Top 10",
+            "Reds",
         )
-        fig.update_yaxes(automargin=True)
         st.plotly_chart(fig, use_container_width=True)
 
     with tab3:
         st.subheader("节点和边数据")
 
+        nodes_csv, edges_csv = load_keyword_network_csv(selected_year)
         col1, col2 = st.columns(2)
 
         with col1:
             st.markdown("#### 关键词节点")
-            nodes_df = pd.DataFrame(nodes_data).sort_values(
-                "frequency", ascending=False
-            )
             st.dataframe(nodes_df, use_container_width=True, height=400)
 
-            csv = nodes_df.to_csv(index=False, encoding="utf-8-sig").encode("utf-8")
             st.download_button(
-                "📥 下载节点数据", csv, f"nodes_{selected_year}.csv", "text/csv"
+                "📥 下载节点数据", nodes_csv, f"nodes_{selected_year}.csv", "text/csv"
             )
 
         with col2:
             st.markdown("#### 共现关系")
-            edges_df = pd.DataFrame(edges_data).sort_values("weight", ascending=False)
             st.dataframe(edges_df, use_container_width=True, height=400)
 
-            csv = edges_df.to_csv(index=False, encoding="utf-8-sig").encode("utf-8")
             st.download_button(
-                "📥 下载边数据", csv, f"edges_{selected_year}.csv", "text/csv"
+                "📥 下载边数据", edges_csv, f"edges_{selected_year}.csv", "text/csv"
             )
 
 
@@ -508,16 +789,8 @@ def page_keyword_network():
 def page_annual_report():
     st.title("2025年度微博热搜分析报告")
 
-    # 导入年度报告模块
-    try:
-        from src.annual_report import generate_annual_report
-    except ImportError:
-        from annual_report import generate_annual_report
-
     # 设置字体
     try:
-        from src.json_analyzer import setup_font
-
         setup_font()
     except:
         pass
@@ -601,8 +874,6 @@ def page_annual_report():
                 months = sorted(temporal_dist.keys())
                 counts = [temporal_dist[m] for m in months]
 
-                import plotly.express as px
-
                 fig = px.line(
                     x=months,
                     y=counts,
@@ -632,22 +903,17 @@ def page_annual_report():
                     }
                 )
 
-            df_top = pd.DataFrame(rank_data)
+            df_top = pd.DataFrame.from_records(
+                rank_data, columns=["排名", "标题", "热度", "在榜排名"]
+            )
             st.dataframe(df_top, use_container_width=True, hide_index=True)
 
             # 热度柱状图
-            import plotly.express as px
-
-            fig = px.bar(
-                x=list(range(1, len(top_titles) + 1)),
-                y=[item.get("heat", 0) for item in top_titles],
-                labels={"x": "排名", "y": "热度值"},
-                title="热度排名前10的热搜",
-                color=[item.get("heat", 0) for item in top_titles],
-                color_continuous_scale="Reds",
-                text=[item.get("title", "")[:20] for item in top_titles],
+            fig = build_top_titles_figure(
+                tuple(
+                    (item.get("title", ""), item.get("heat", 0)) for item in top_titles
+                )
             )
-            fig.update_traces(textposition="outside")
             st.plotly_chart(fig, use_container_width=True)
         else:
             st.info("暂无热搜排名数据")
@@ -659,46 +925,43 @@ def page_annual_report():
         keyword_freq = summary.get("keyword_frequency", {})
 
         if keyword_freq:
+            # 关键词按频率排序一次，结果按报告的数据范围存入 session_state，
+            # 图表、指标和列表共用，重复渲染时不再扫描整个词频字典
+            date_range = summary.get("date_range", {})
+            stats_key = (
+                f"kw_stats_{date_range.get('start')}_{date_range.get('end')}"
+                f"_{summary.get('total_records', 0)}"
+            )
+            if stats_key not in st.session_state:
+                st.session_state[stats_key] = tuple(
+                    sorted(keyword_freq.items(), key=lambda x: x[1], reverse=True)
+                )
+            ranked_keywords = st.session_state[stats_key]
+            top_keyword, top_frequency = ranked_keywords[0]
+
             # 关键词排行
             col1, col2 = st.columns([2, 1])
 
             with col1:
                 # 热力图
-                import plotly.express as px
-
-                top_keywords = dict(
-                    sorted(keyword_freq.items(), key=lambda x: x[1], reverse=True)[:20]
-                )
-
-                fig = px.bar(
-                    x=list(top_keywords.values()),
-                    y=list(top_keywords.keys()),
-                    orientation="h",
-                    title="关键词频率 Top 20",
-                    labels={"x": "出现次数", "y": "关键词"},
-                    color=list(top_keywords.values()),
-                    color_continuous_scale="Viridis",
+                fig = build_bar_figure(
+                    ranked_keywords[:20],
+                    "关键词频率 Top 20",
+                    "Viridis",
+                    x_label="出现次数",
+                    y_label="关键词",
                 )
-                fig.update_yaxes(automargin=True)
                 st.plotly_chart(fig, use_container_width=True)
 
             with col2:
-                st.metric("总关键词数", len(keyword_freq))
-                st.metric(
-                    "最频繁关键词",
-                    max(keyword_freq, key=keyword_freq.get) if keyword_freq else "N/A",
-                )
-                st.metric("最高频率", max(keyword_freq.values()) if keyword_freq else 0)
+                st.metric("总关键词数", len(ranked_keywords))
+                st.metric("最频繁关键词", top_keyword)
+                st.metric("最高频率", top_frequency)
 
             # 关键词表
             st.markdown("#### 📋 关键词列表")
-            keyword_df = pd.DataFrame(
-                [
-                    {"关键词": k, "频率": v}
-                    for k, v in sorted(
-                        keyword_freq.items(), key=lambda x: x[1], reverse=True
-                    )
-                ]
+            keyword_df = pd.DataFrame.from_records(
+                ranked_keywords, columns=["关键词", "频率"]
             )
             st.dataframe(keyword_df, use_container_width=True, height=400)
         else:
@@ -738,21 +1001,22 @@ def page_annual_report():
         temporal_dist = report.get("temporal_distribution", {})
 
         if temporal_dist:
+            # 按月份排序后一次性转为数组，表格、累积图和指标共用
+            months = sorted(temporal_dist)
+            month_counts = np.fromiter(
+                (temporal_dist[m] for m in months), dtype=np.int32, count=len(months)
+            )
+
             col1, col2 = st.columns([2, 1])
 
             with col1:
                 # 月度分布表
-                months = sorted(temporal_dist.keys())
-                month_data = [{"月份": m, "热搜数": temporal_dist[m]} for m in months]
-
-                df_temporal = pd.DataFrame(month_data)
+                df_temporal = pd.DataFrame({"月份": months, "热搜数": month_counts})
                 st.dataframe(df_temporal, use_container_width=True, hide_index=True)
 
             with col1:
                 # 累积图
-                import plotly.graph_objects as go
-
-                cumulative = np.cumsum([temporal_dist[m] for m in months])
+                cumulative = month_counts.cumsum()
 
                 fig = go.Figure()
                 fig.add_trace(
@@ -774,9 +1038,9 @@ def page_annual_report():
                 st.plotly_chart(fig, use_container_width=True)
 
             with col2:
-                st.metric("平均月度", f"{np.mean(list(temporal_dist.values())):.0f}")
-                st.metric("最高月份", f"{max(temporal_dist.values())}")
-                st.metric("最低月份", f"{min(temporal_dist.values())}")
+                st.metric("平均月度", f"{month_counts.mean():.0f}")
+                st.metric("最高月份", f"{month_counts.max()}")
+                st.metric("最低月份", f"{month_counts.min()}")
         else:
             st.info("暂无时间分布数据")
 
@@ -788,10 +1052,9 @@ def page_annual_report():
 
     with col1:
         # 导出 JSON
-        json_report = json.dumps(report, ensure_ascii=False, indent=2)
         st.download_button(
             label="📥 下载完整报告 (JSON)",
-            data=json_report.encode("utf-8"),
+            data=json_dumps_bytes(report),
             file_name="annual_report_2025.json",
             mime="application/json",
         )
@@ -831,22 +1094,50 @@ def page_annual_report():
 
 
 # -------- 词云图可视化页面 -------- #
-@register_page("月度热搜词云图")
-def page_word_cloud_visualization():
-    st.title("月度热搜词云图")
+# 词云图文件名：<前缀>_<年份>[-Q<季度>|-<月份>]
+WORD_CLOUD_NAME_RE = re.compile(
+    r"_(?P<year>\d{4})(?:-(?:(?P<quarter>Q[1-4])|(?P<month>\d{2})))?$"
+)
 
-    import os
-    from pathlib import Path
 
-    # 获取词云图目录
-    word_clouds_dir = Path("output/word_clouds")
+def classify_word_cloud_files(file_stems: List[str]) -> Dict[str, str]:
+    """将词云图文件名映射为时间范围显示名称，无法识别的文件名会被忽略"""
+    month_display = {}
+    for filename in file_stems:
+        match = WORD_CLOUD_NAME_RE.search(filename)
+        if match is None:
+            continue
 
-    if not word_clouds_dir.exists():
-        st.error("词云图目录不存在，请先运行数据处理生成词云图")
-        return
+        if match["quarter"]:
+            month_display[filename] = f"季度汇总 ({match['quarter']})"
+        elif match["month"]:
+            month_display[filename] = f"{match['year']}年{match['month']}月"
+        else:
+            month_display[filename] = f"全年汇总 ({match['year']})"
+
+    return month_display
+
+
+@st.cache_data(ttl=60)
+def list_word_cloud_files(folder: str) -> Dict[str, str]:
+    """扫描目录下的词云图并解析时间范围，目录不存在时返回空字典"""
+    try:
+        with os.scandir(folder) as it:
+            stems = sorted(
+                entry.name[: -len(".png")]
+                for entry in it
+                if entry.name.endswith(".png")
+                and not entry.name.startswith("custom_analysis")
+            )
+    except FileNotFoundError:
+        return {}
+    return classify_word_cloud_files(stems)
 
-    # 居中显示选项
-    st.markdown("### 📊 词云图查看器")
+
+@fragment
+def render_word_cloud_viewer(word_clouds_root: str) -> None:
+    """词云图选择与展示片段"""
+    word_clouds_dir = Path(word_clouds_root)
 
     # 创建居中的选项区域
     col1, col2, col3, col4, col5 = st.columns([1, 2, 2, 2, 1])
@@ -864,42 +1155,14 @@ def page_word_cloud_visualization():
         type_folder = "keywords" if viz_type == "关键词" else "types"
         folder_path = word_clouds_dir / type_folder
 
-        # 扫描可用的图片文件
-        available_files = []
-        if folder_path.exists():
-            available_files = sorted(
-                [
-                    f.stem
-                    for f in folder_path.glob("*.png")
-                    if not f.name.startswith("custom_analysis")
-                ]
-            )
+        # 扫描可用的图片文件并构建月份选项（结果缓存60秒）
+        month_display = list_word_cloud_files(str(folder_path))
 
-        if not available_files:
-            st.warning(f"未找到{viz_type}词云图")
+        if not month_display:
+            st.warning(f"未找到{viz_type}词云图，请先运行数据处理生成词云图")
             return
 
-        # 构建月份选项
-        month_options = []
-        month_display = {}
-
-        for filename in available_files:
-            if filename.endswith("2025"):
-                display_name = "全年汇总 (2025)"
-                month_options.append(filename)
-                month_display[filename] = display_name
-            elif "Q" in filename:
-                quarter = filename.split("-")[-1]
-                display_name = f"季度汇总 ({quarter})"
-                month_options.append(filename)
-                month_display[filename] = display_name
-            elif "-" in filename:
-                parts = filename.split("_")[-1].split("-")
-                if len(parts) == 2:
-                    year, month = parts
-                    display_name = f"{year}年{month}月"
-                    month_options.append(filename)
-                    month_display[filename] = display_name
+        month_options = list(month_display)
 
         # 选择月份
         selected_file = st.selectbox(
@@ -912,21 +1175,23 @@ def page_word_cloud_visualization():
     with col4:
         # 添加刷新按钮
         if st.button("🔄 刷新", help="重新加载词云图"):
+            list_word_cloud_files.clear()
             st.rerun()
 
     # 显示词云图
     if selected_file:
         image_path = folder_path / f"{selected_file}.png"
 
-        if image_path.exists():
+        # 直接读取图片，文件被删除时再提示（图片字节按路径和修改时间缓存）
+        try:
+            image_bytes = read_file_bytes(str(image_path), image_path.stat().st_mtime)
+        except FileNotFoundError:
+            st.error(f"词云图文件不存在：{image_path}")
+        else:
             # 居中显示词云图
             col_left, col_center, col_right = st.columns([0.5, 3, 0.5])
             with col_center:
-                st.image(str(image_path), use_column_width=True)
-
-            # 显示下载按钮
-            with open(image_path, "rb") as f:
-                image_bytes = f.read()
+                st.image(image_bytes, use_column_width=True)
 
             st.download_button(
                 label="📥 下载词云图",
@@ -946,13 +1211,41 @@ def page_word_cloud_visualization():
                             st.markdown(f"**✓ {month_display[file]}**")
                         else:
                             st.markdown(f"- {month_display[file]}")
-        else:
-            st.error(f"词云图文件不存在：{image_path}")
     else:
         st.warning("请选择要查看的时间范围")
 
 
+@register_page("月度热搜词云图")
+def page_word_cloud_visualization():
+    st.title("月度热搜词云图")
+
+    # 获取词云图目录
+    word_clouds_dir = Path("output/word_clouds")
+
+    # 居中显示选项
+    st.markdown("### 📊 词云图查看器")
+
+    # 切换维度或时间范围时只重新运行查看器片段
+    render_word_cloud_viewer(str(word_clouds_dir))
+
+
 # -------- 去年今日页面 -------- #
+@st.cache_resource
+def get_random_hot_today():
+    """缓存RandomHotToday实例"""
+    return RandomHotToday()
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def load_matching_hot_items(date_key: str) -> List[Dict[str, Any]]:
+    """加载与今日相近的历史热搜，按日期缓存，跨天自动失效"""
+    # 缓存的实例由所有会话共用，不能直接修改其日期；
+    # 浅拷贝后只替换比较基准日期，已加载的只读数据仍然共用
+    random_today = copy.copy(get_random_hot_today())
+    random_today.today = datetime.strptime(date_key, "%Y-%m-%d")
+    return random_today.load_and_filter_data()
+
+
 @register_page("去年今日")
 def page_random_hot_today():
     st.title("去年今日")
@@ -964,12 +1257,6 @@ def page_random_hot_today():
     - 🔥 热度：大于 1 的条目
     """)
 
-    # 导入模块
-    try:
-        from src.random_hot_today import RandomHotToday
-    except ImportError:
-        from random_hot_today import RandomHotToday
-
     # 创建两列布局
     col1, col2 = st.columns([3, 1])
 
@@ -984,32 +1271,32 @@ def page_random_hot_today():
     if "random_hot_today_cache" not in st.session_state:
         st.session_state.random_hot_today_cache = None
 
-    # 执行查询
+    # 执行查询（候选数据按日期缓存，仅在没有选中项时重新抽取）
     with st.spinner("正在从历史数据中查找..."):
         try:
-            random_today = RandomHotToday()
-
-            # 加载并筛选数据
-            matching_items = random_today.load_and_filter_data()
+            matching_items = load_matching_hot_items(
+                datetime.now().strftime("%Y-%m-%d")
+            )
 
             if not matching_items:
                 st.warning("❌ 未找到符合条件的数据")
                 st.info("💡 请确保已加载足够的历史数据")
                 return
 
-            # 随机选择一条
-            selected_item = random_today.select_random_item(matching_items)
+            if st.session_state.random_hot_today_cache is None:
+                # 随机选择一条
+                selected_item = get_random_hot_today().select_random_item(
+                    matching_items
+                )
 
-            if selected_item:
-                st.session_state.random_hot_today_cache = selected_item
-            else:
-                st.error("未能选择数据")
-                return
+                if selected_item:
+                    st.session_state.random_hot_today_cache = selected_item
+                else:
+                    st.error("未能选择数据")
+                    return
 
         except Exception as e:
             st.error(f"❌ 加载数据失败: {str(e)}")
-            import traceback
-
             with st.expander("查看错误详情"):
                 st.code(traceback.format_exc())
             return
@@ -1050,12 +1337,13 @@ def page_random_hot_today():
 
         # 两列显示
         col1, col2 = st.columns(2)
+        info_items = iter(info_data.items())
         with col1:
-            for key in list(info_data.keys())[:3]:
-                st.markdown(f"**{key}** {info_data[key]}")
+            for key, value in islice(info_items, 3):
+                st.markdown(f"**{key}** {value}")
         with col2:
-            for key in list(info_data.keys())[3:]:
-                st.markdown(f"**{key}** {info_data[key]}")
+            for key, value in info_items:
+                st.markdown(f"**{key}** {value}")
 
         st.markdown("---")
 
@@ -1078,57 +1366,60 @@ def page_random_hot_today():
         # 导出选项
         st.markdown("### 💾 导出数据")
 
+        # 导出内容只在选中项变化时生成一次，之后的重新运行直接复用，
+        # 文本中的生成时间也因此保持稳定
+        exports = st.session_state.get("random_hot_today_exports")
+        if exports is None or exports[0] is not item:
+            current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            text_output = f"""去年今日 - {date}
+{"=" * 50}
+
+标题: {title}
+排名: #{rank}
+分类: {category if category else "未分类"}
+
+热度数据:
+- 热度值: {heat:.2f}
+- 阅读量: {reads:.0f}
+- 讨论量: {discussions:.0f}
+- 原创量: {originals:.0f}
+
+生成时间: {current_time}
+"""
+            exports = (
+                item,
+                json_dumps_bytes(item),
+                dataframe_to_csv_bytes(pd.DataFrame.from_records([item])),
+                text_output.encode("utf-8"),
+            )
+            st.session_state.random_hot_today_exports = exports
+        _, json_bytes, csv_bytes, text_bytes = exports
+
         col1, col2, col3 = st.columns(3)
 
         with col1:
             # JSON 导出
-            json_str = json.dumps(item, ensure_ascii=False, indent=2)
             st.download_button(
                 label="📥 JSON 格式",
-                data=json_str.encode("utf-8"),
+                data=json_bytes,
                 file_name=f"hot_today_{date}.json",
                 mime="application/json",
             )
 
         with col2:
             # CSV 导出
-            import csv
-            import io
-
-            csv_buffer = io.StringIO()
-            writer = csv.DictWriter(csv_buffer, fieldnames=item.keys())
-            writer.writeheader()
-            writer.writerow(item)
-            csv_data = csv_buffer.getvalue()
-
             st.download_button(
                 label="📥 CSV 格式",
-                data=csv_data.encode("utf-8"),
+                data=csv_bytes,
                 file_name=f"hot_today_{date}.csv",
                 mime="text/csv",
             )
 
         with col3:
             # 文本导出
-            current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            text_output = f"""去年今日 - {date}
-{"=" * 50}
-
-标题: {title}
-排名: #{rank}
-分类: {category if category else "未分类"}
-
-热度数据:
-- 热度值: {heat:.2f}
-- 阅读量: {reads:.0f}
-- 讨论量: {discussions:.0f}
-- 原创量: {originals:.0f}
-
-生成时间: {current_time}
-"""
             st.download_button(
                 label="📥 文本格式",
-                data=text_output.encode("utf-8"),
+                data=text_bytes,
                 file_name=f"hot_today_{date}.txt",
                 mime="text/plain",
             )
@@ -1147,6 +1438,38 @@ def page_random_hot_today():
 
 
 # -------- 高级数据查询页面 -------- #
+# 查询结果表的列结构，结果直接构建为 Arrow 表用于展示、导出和统计
+QUERY_RESULT_SCHEMA = pa.schema(
+    [
+        ("rank", pa.int64()),
+        ("title", pa.string()),
+        ("category", pa.string()),
+        ("heat", pa.float64()),
+        ("reads", pa.float64()),
+        ("discussions", pa.float64()),
+        ("originals", pa.float64()),
+        ("date", pa.string()),
+    ]
+)
+
+QUERY_RESULT_COLUMN_CONFIG = {
+    "rank": st.column_config.NumberColumn("排名", format="%d"),
+    "title": st.column_config.TextColumn("标题"),
+    "category": st.column_config.TextColumn("分类"),
+    "heat": st.column_config.NumberColumn("热度", format="%.2f"),
+    "reads": st.column_config.NumberColumn("阅读量", format="%.0f"),
+    "discussions": st.column_config.NumberColumn("讨论量", format="%.0f"),
+    "originals": st.column_config.NumberColumn("原创量", format="%.0f"),
+    "date": st.column_config.TextColumn("日期"),
+}
+
+
+def count_non_empty_distinct(column: pa.ChunkedArray) -> int:
+    """统计列中非空且非空字符串的不同取值个数"""
+    column = pc.if_else(pc.equal(column, ""), None, column)
+    return pc.count_distinct(column).as_py()
+
+
 @register_page("智慧搜索")
 def page_advanced_query():
     st.title("智慧搜索系统")
@@ -1252,6 +1575,17 @@ def page_advanced_query():
         selected_sort = st.selectbox("选择排序方式", options=list(sort_options.keys()))
         sort_by = sort_options[selected_sort]
 
+        # 返回条数上限
+        st.markdown("#### 🔢 返回条数")
+        limit = st.number_input(
+            "最大返回条数",
+            min_value=1,
+            max_value=100000,
+            value=5000,
+            step=1000,
+            help="限制结果条数，避免未设置筛选条件时返回并分析全部数据",
+        )
+
     # ========== 执行查询 ==========
     st.markdown("### 3. 执行查询与分析")
 
@@ -1311,6 +1645,9 @@ def page_advanced_query():
                 # 排序方式
                 query_params["sort_by"] = sort_by
 
+                # 返回条数上限
+                query_params["limit"] = int(limit)
+
                 # 执行查询
                 results = query.query(**query_params)
 
@@ -1319,143 +1656,136 @@ def page_advanced_query():
                     return
 
                 st.success(f"✅ 查询成功！找到 {len(results)} 条符合条件的数据")
+                if len(results) >= limit:
+                    st.warning(
+                        f"⚠️ 结果已达到返回上限 {int(limit)} 条，"
+                        "仅展示和分析排序靠前的部分，可收紧筛选条件或调高上限"
+                    )
 
-                # 保存查询结果到临时文件
-                import os
-                import tempfile
-                from datetime import datetime
-
+                # 保存查询结果到临时目录，退出 with 块时整个目录自动清理
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                temp_dir = tempfile.mkdtemp()
-                temp_json_path = os.path.join(
-                    temp_dir, f"query_results_{timestamp}.json"
-                )
-
-                # 保存结果
-                query.save_results(results, temp_json_path)
-
-                # ========== 显示查询结果表格 ==========
-                st.markdown("### 4. 查询结果表格")
-
-                # 转换为DataFrame用于显示
-                df_results = pd.DataFrame(results)
-
-                # 显示数据预览
-                st.dataframe(df_results, use_container_width=True, height=400)
-
-                # 下载按钮
-                col_d1, col_d2 = st.columns(2)
-                with col_d1:
-                    # 下载JSON
-                    with open(temp_json_path, "r", encoding="utf-8") as f:
-                        json_data = f.read()
-                    st.download_button(
-                        label="📥 下载JSON数据",
-                        data=json_data,
-                        file_name=f"query_results_{timestamp}.json",
-                        mime="application/json",
+                with tempfile.TemporaryDirectory() as temp_dir:
+                    temp_json_path = os.path.join(
+                        temp_dir, f"query_results_{timestamp}.json"
                     )
 
-                with col_d2:
-                    # 下载CSV
-                    csv_data = df_results.to_csv(index=False, encoding="utf-8-sig")
-                    st.download_button(
-                        label="📥 下载CSV数据",
-                        data=csv_data.encode("utf-8"),
-                        file_name=f"query_results_{timestamp}.csv",
-                        mime="text/csv",
+                    # 保存结果
+                    query.save_results(results, temp_json_path)
+
+                    # ========== 显示查询结果表格 ==========
+                    st.markdown("### 4. 查询结果表格")
+
+                    # 直接构建 Arrow 表用于显示，省去 pandas 推断和再转换
+                    results_table = pa.Table.from_pylist(
+                        results, schema=QUERY_RESULT_SCHEMA
                     )
 
-                # ========== 数据分析与可视化 ==========
-                st.markdown("### 5. 数据分析与可视化")
+                    # 显示数据预览
+                    st.dataframe(
+                        results_table,
+                        column_config=QUERY_RESULT_COLUMN_CONFIG,
+                        use_container_width=True,
+                        height=400,
+                    )
 
-                with st.spinner("正在进行数据分析，生成可视化图表..."):
-                    try:
-                        # 创建输出目录
-                        output_dir_name = f"query_analysis_{timestamp}"
-                        output_dir = Path("output") / output_dir_name
-                        output_dir.mkdir(parents=True, exist_ok=True)
+                    # 下载按钮
+                    col_d1, col_d2 = st.columns(2)
+                    with col_d1:
+                        # 下载JSON（直接读取已保存文件的字节，省去解码再编码）
+                        with open(temp_json_path, "rb") as f:
+                            json_data = f.read()
+                        st.download_button(
+                            label="📥 下载JSON数据",
+                            data=json_data,
+                            file_name=f"query_results_{timestamp}.json",
+                            mime="application/json",
+                        )
 
-                        # 调用json_analyzer分析数据
-                        analysis_result = analyze_data(
-                            results, output_dir_name, temp_json_path
+                    with col_d2:
+                        # 下载CSV
+                        st.download_button(
+                            label="📥 下载CSV数据",
+                            data=arrow_table_to_csv_bytes(results_table),
+                            file_name=f"query_results_{timestamp}.csv",
+                            mime="text/csv",
                         )
 
-                        st.success("✅ 数据分析完成！")
+                    # ========== 数据分析与可视化 ==========
+                    st.markdown("### 5. 数据分析与可视化")
 
-                        # 显示生成的图表
-                        chart_files = list(output_dir.glob("*.png"))
-                        if chart_files:
-                            st.markdown("#### 📈 分析图表")
+                    with st.spinner("正在进行数据分析，生成可视化图表..."):
+                        try:
+                            # 创建输出目录
+                            output_dir_name = f"query_analysis_{timestamp}"
+                            output_dir = Path("output") / output_dir_name
+                            output_dir.mkdir(parents=True, exist_ok=True)
 
-                            # 创建选项卡显示图表
-                            tabs = st.tabs(
-                                [f"图表{i + 1}" for i in range(len(chart_files))]
+                            # 调用json_analyzer分析数据
+                            analysis_result = analyze_data(
+                                results, output_dir_name, temp_json_path
                             )
 
-                            for tab, chart_file in zip(tabs, chart_files):
-                                with tab:
-                                    st.image(
-                                        str(chart_file),
-                                        use_column_width=True,
-                                        caption=chart_file.name,
-                                    )
-
-                            # 显示分析报告
-                            report_file = output_dir / "analysis_report.txt"
-                            if report_file.exists():
-                                with st.expander("📄 查看分析报告"):
-                                    with open(report_file, "r", encoding="utf-8") as f:
-                                        report_content = f.read()
-                                    st.text(report_content)
-
-                        # 显示统计信息
-                        st.markdown("#### 📊 数据统计")
-                        col_s1, col_s2, col_s3, col_s4 = st.columns(4)
-
-                        with col_s1:
-                            st.metric("总记录数", len(results))
-
-                        with col_s2:
-                            if results:
-                                avg_heat = sum(r.get("heat", 0) for r in results) / len(
-                                    results
+                            st.success("✅ 数据分析完成！")
+
+                            # 显示生成的图表
+                            chart_files, report_file, _ = scan_output_dir(output_dir)
+                            if chart_files:
+                                st.markdown("#### 📈 分析图表")
+
+                                # 创建选项卡显示图表
+                                tabs = st.tabs(
+                                    [f"图表{i + 1}" for i in range(len(chart_files))]
                                 )
+
+                                for tab, chart_file in zip(tabs, chart_files):
+                                    with tab:
+                                        st.image(
+                                            chart_file.path,
+                                            use_column_width=True,
+                                            caption=chart_file.name,
+                                        )
+
+                                # 显示分析报告
+                                if report_file is not None:
+                                    with st.expander("📄 查看分析报告"):
+                                        with open(
+                                            report_file.path, "r", encoding="utf-8"
+                                        ) as f:
+                                            report_content = f.read()
+                                        st.text(report_content)
+
+                            # 显示统计信息
+                            st.markdown("#### 📊 数据统计")
+                            col_s1, col_s2, col_s3, col_s4 = st.columns(4)
+
+                            with col_s1:
+                                st.metric("总记录数", len(results))
+
+                            # 直接在已构建的 Arrow 表上做列式统计
+                            with col_s2:
+                                avg_heat = pc.mean(
+                                    pc.fill_null(results_table["heat"], 0)
+                                ).as_py()
                                 st.metric("平均热度", f"{avg_heat:.1f}")
 
-                        with col_s3:
-                            if results:
-                                unique_categories = set(
-                                    r.get("category", "")
-                                    for r in results
-                                    if r.get("category")
+                            with col_s3:
+                                st.metric(
+                                    "分类数量",
+                                    count_non_empty_distinct(results_table["category"]),
                                 )
-                                st.metric("分类数量", len(unique_categories))
 
-                        with col_s4:
-                            if results and "date" in results[0]:
-                                dates = set(
-                                    r.get("date", "") for r in results if r.get("date")
+                            with col_s4:
+                                st.metric(
+                                    "日期数量",
+                                    count_non_empty_distinct(results_table["date"]),
                                 )
-                                st.metric("日期数量", len(dates))
-
-                    except Exception as e:
-                        st.error(f"数据分析失败: {str(e)}")
-                        import traceback
 
-                        st.error(traceback.format_exc())
-
-                # 清理临时文件
-                try:
-                    os.unlink(temp_json_path)
-                    os.rmdir(temp_dir)
-                except:
-                    pass
+                        except Exception as e:
+                            st.error(f"数据分析失败: {str(e)}")
+                            st.error(traceback.format_exc())
 
             except Exception as e:
                 st.error(f"查询失败: {str(e)}")
-                import traceback
-
                 st.error(traceback.format_exc())
 
     # ========== 查询示例 ==========
@@ -1525,74 +1855,90 @@ def page_json_analysis():
     analyze_button = st.button("🚀 开始分析", type="primary", use_container_width=True)
 
     if analyze_button:
-        # 确定要分析的文件
-        json_file = None
+        # 确定要分析的数据：上传的文件直接以内存中的字节串分析，无需写入临时文件
         if uploaded_file is not None:
-            # 保存上传的文件到临时位置
-            import os
-            import tempfile
-
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".json") as tmp_file:
-                tmp_file.write(uploaded_file.getvalue())
-                json_file = tmp_file.name
-                st.info(f"已上传文件: {uploaded_file.name}")
+            json_source = uploaded_file.getvalue()
+            file_name = Path(uploaded_file.name).stem
+            st.info(f"已上传文件: {uploaded_file.name}")
         elif file_path and os.path.exists(file_path):
-            json_file = file_path
+            json_source = file_path
+            file_name = Path(file_path).stem
             st.info(f"使用文件: {file_path}")
         else:
             st.error("请上传文件或输入有效的文件路径")
             return
 
-        if json_file:
-            try:
-                # 设置字体
-                from src.json_analyzer import setup_font
-
-                setup_font(font_name)
+        # 设置字体
+        setup_font(font_name)
+
+        # 在后台线程执行分析，输出目录以文件名命名；
+        # 脚本线程不再被整个分析过程阻塞，通过重新运行轮询进度。
+        # 本会话尚未开始的上一个任务直接取消；已开始的任务会运行至结束，即使会话已关闭
+        previous_job = st.session_state.get("json_analysis_job")
+        if previous_job is not None:
+            previous_job["future"].cancel()
+        st.session_state.json_analysis_job = {
+            "future": get_analysis_executor().submit(
+                analyze_json, json_source, file_name
+            ),
+            "file_name": file_name,
+        }
 
-                # 执行分析
-                with st.spinner("正在分析数据，请稍候..."):
-                    from src.json_analyzer import analyze_json
+    analysis_pending = False
+    job = st.session_state.get("json_analysis_job")
+    if job is not None and not job["future"].done():
+        analysis_pending = True
+        st.info("⏳ 正在后台分析数据，请稍候...")
+    elif job is not None:
+        # 分析已结束，展示一次结果后清除任务
+        del st.session_state.json_analysis_job
+        file_name = job["file_name"]
+        try:
+            job["future"].result()
 
-                    # 调用分析函数
-                    analyze_json(json_file)
+            st.success("✅ 分析完成！")
 
-                st.success("✅ 分析完成！")
+            # 显示输出信息
+            st.markdown("### 4. 分析结果")
 
-                # 显示输出信息
-                st.markdown("### 4. 分析结果")
+            # 获取输出目录（基于文件名）
+            output_dir = Path("output") / file_name
 
-                # 获取输出目录（基于文件名）
-                import datetime
-                from pathlib import Path
+            if output_dir.exists():
+                st.info(f"分析结果已保存到: `{output_dir}`")
 
-                file_name = Path(json_file).stem
-                output_dir = Path("output") / f"{file_name}"
+                # 单次扫描输出目录，图表、报告和打包共用结果
+                png_files, report_file, output_files = scan_output_dir(output_dir)
 
-                if output_dir.exists():
-                    st.info(f"分析结果已保存到: `{output_dir}`")
+                # ZIP 打包和报告读取互不依赖，提交到后台线程，
+                # 与图表渲染同时进行，用到结果时再等待
+                executor = get_io_executor()
+                zip_future = executor.submit(build_results_zip, output_files)
+                # 临时 ZIP 一经提交即由此处负责删除：即使后续渲染出错也不会遗留
+                try:
+                    report_future = (
+                        executor.submit(read_text_file, report_file.path)
+                        if report_file is not None
+                        else None
+                    )
 
                     # 列出生成的图表文件
-                    png_files = list(output_dir.glob("*.png"))
                     if png_files:
                         st.markdown("**生成的图表：**")
-                        cols = st.columns(3)
-                        for idx, png_file in enumerate(png_files[:6]):  # 最多显示6个
-                            with cols[idx % 3]:
-                                st.image(
-                                    str(png_file),
-                                    caption=png_file.name,
-                                    use_column_width=True,
-                                )
+                        # 最多显示6个，作为一个图片组件一次性发送，按固定宽度自动换行排列
+                        shown_files = png_files[:6]
+                        st.image(
+                            [png_file.path for png_file in shown_files],
+                            caption=[png_file.name for png_file in shown_files],
+                            width=400,
+                        )
 
                         if len(png_files) > 6:
                             st.info(f"还有 {len(png_files) - 6} 个图表未显示")
 
                     # 检查分析报告
-                    report_file = output_dir / "analysis_report.txt"
-                    if report_file.exists():
-                        with open(report_file, "r", encoding="utf-8") as f:
-                            report_content = f.read()
+                    if report_future is not None:
+                        report_content = report_future.result()
 
                         with st.expander("📄 查看分析报告", expanded=False):
                             st.text(report_content)
@@ -1608,39 +1954,22 @@ def page_json_analysis():
                     # 提供下载所有结果的选项
                     st.markdown("**下载所有结果：**")
 
-                    # 创建ZIP文件
-                    import io
-                    import zipfile
-
-                    zip_buffer = io.BytesIO()
-                    with zipfile.ZipFile(
-                        zip_buffer, "w", zipfile.ZIP_DEFLATED
-                    ) as zip_file:
-                        for file_path in output_dir.glob("*"):
-                            if file_path.is_file():
-                                zip_file.write(file_path, file_path.name)
-
-                    zip_buffer.seek(0)
-
-                    st.download_button(
-                        label="📦 下载所有图表和报告 (ZIP)",
-                        data=zip_buffer,
-                        file_name=f"analysis_results_{file_name}.zip",
-                        mime="application/zip",
-                    )
-
-                # 清理临时文件
-                if uploaded_file is not None:
-                    import os
-
-                    os.unlink(json_file)
-
-            except Exception as e:
-                st.error(f"分析过程中出错: {str(e)}")
-                import traceback
+                    zip_path = zip_future.result()
+                    with open(zip_path, "rb") as zip_stream:
+                        st.download_button(
+                            label="📦 下载所有图表和报告 (ZIP)",
+                            data=zip_stream,
+                            file_name=f"analysis_results_{file_name}.zip",
+                            mime="application/zip",
+                        )
+                finally:
+                    if zip_future.exception() is None:
+                        os.unlink(zip_future.result())
 
-                with st.expander("查看错误详情"):
-                    st.code(traceback.format_exc())
+        except Exception as e:
+            st.error(f"分析过程中出错: {str(e)}")
+            with st.expander("查看错误详情"):
+                st.code(traceback.format_exc())
 
     # 示例数据
     with st.expander("📋 查看示例JSON格式", expanded=False):
@@ -1664,6 +1993,37 @@ def page_json_analysis():
             language="json",
         )
 
+    # 分析仍在进行时，稍后重新运行页面以刷新进度
+    if analysis_pending:
+        time.sleep(0.5)
+        st.rerun()
+
+
+# -------- 系统状态统计 -------- #
+def count_files(root: str, suffix: str) -> Optional[int]:
+    """递归统计目录下指定后缀的文件数，目录不存在时返回 None"""
+    if not os.path.isdir(root):
+        return None
+    # 直接用 os.scandir 遍历，复用目录项自带的类型信息，只累加计数
+    count = 0
+    pending = [root]
+    while pending:
+        with os.scandir(pending.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.name.endswith(suffix):
+                    count += 1
+    return count
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def count_files_parallel(targets: Tuple[Tuple[str, str], ...]) -> List[Optional[int]]:
+    """并行统计多个目录的文件数（各目录遍历互不依赖），结果缓存30秒"""
+    executor = get_io_executor()
+    futures = [executor.submit(count_files, root, suffix) for root, suffix in targets]
+    return [future.result() for future in futures]
+
 
 # -------- 主入口 -------- #
 def main():
@@ -1736,29 +2096,27 @@ def main():
 
     st.sidebar.markdown("---")
     st.sidebar.markdown("### ⚙️ 系统状态")
-    import os
-    from pathlib import Path
-
-    # 统计数据
-    data_dir = Path("data")
-    output_dir = Path("output/word_clouds")
-    network_dir = Path("output/word_networks")
 
-    if data_dir.exists():
-        json_files = list(data_dir.glob("**/*.json"))
-        st.sidebar.success(f"✓ 已存储 {len(json_files)} 个数据文件")
+    # 统计数据（三个目录在后台线程中同时遍历，结果缓存30秒）
+    json_count, img_count, network_count = count_files_parallel(
+        (
+            ("data", ".json"),
+            ("output/word_clouds", ".png"),
+            ("output/word_networks", ".json"),
+        )
+    )
+    if json_count is not None:
+        st.sidebar.success(f"✓ 已存储 {json_count} 个数据文件")
     else:
         st.sidebar.warning("⚠ 数据目录不存在")
 
-    if output_dir.exists():
-        img_files = list(output_dir.glob("**/*.png"))
-        st.sidebar.success(f"✓ 已生成 {len(img_files)} 张词云图")
+    if img_count is not None:
+        st.sidebar.success(f"✓ 已生成 {img_count} 张词云图")
     else:
         st.sidebar.warning("⚠ 词云图目录不存在")
 
-    if network_dir.exists():
-        network_files = list(network_dir.glob("**/*.json"))
-        st.sidebar.success(f"✓ 已生成 {len(network_files) // 2} 个网络图")
+    if network_count is not None:
+        st.sidebar.success(f"✓ 已生成 {network_count // 2} 个网络图")
     else:
         st.sidebar.warning("⚠ 网络图目录不存在")
 
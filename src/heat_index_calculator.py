@@ -13,6 +13,10 @@
 """
 
 import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
 import numpy as np
 import pandas as pd
 from pathlib import Path
@@ -21,6 +25,22 @@ import warnings
 
 warnings.filterwarnings('ignore')
 
+# 优先使用 orjson 读写 JSON，未安装时回退到标准库
+try:
+    import orjson
+
+    json_loads = orjson.loads
+
+    def json_dumps(obj: Any) -> bytes:
+        """序列化为带缩进的 UTF-8 JSON 字节串"""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    json_loads = json.loads
+
+    def json_dumps(obj: Any) -> bytes:
+        """序列化为带缩进的 UTF-8 JSON 字节串"""
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+
 
 class HeatIndexCalculator:
     """热度指数计算器 - 基于熵权TOPSIS"""
@@ -41,6 +61,26 @@ class HeatIndexCalculator:
         self.normalized_data = None
         self.ideal_solution = None
         self.negative_ideal_solution = None
+        # 中间结果缓冲区，形状和类型不变时在多次计算间复用
+        self.scratch_buffers = {}
+    
+    def get_buffer(self, name: str, shape: Tuple[int, ...], dtype: Any) -> np.ndarray:
+        """
+        获取可复用的中间结果缓冲区，仅在形状或类型变化时重新分配
+        
+        Args:
+            name: 缓冲区名称
+            shape: 数组形状
+            dtype: 数组类型
+            
+        Returns:
+            未初始化的缓冲区数组
+        """
+        buffer = self.scratch_buffers.get(name)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype=dtype)
+            self.scratch_buffers[name] = buffer
+        return buffer
         
     def normalize_data(self, data: np.ndarray) -> np.ndarray:
         """
@@ -54,20 +94,17 @@ class HeatIndexCalculator:
         Returns:
             标准化后的数据矩阵
         """
-        n_samples, n_features = data.shape
-        normalized = np.zeros_like(data, dtype=float)
-        
-        for j in range(n_features):
-            col = data[:, j]
-            col_min = np.min(col)
-            col_max = np.max(col)
-            col_range = col_max - col_min
-            
-            if col_range < self.epsilon:
-                # 如果该列全为同一值，则归一化为0
-                normalized[:, j] = 0
-            else:
-                normalized[:, j] = (col - col_min) / col_range
+        col_min = np.min(data, axis=0, keepdims=True)
+        col_max = np.max(data, axis=0, keepdims=True)
+        col_range = col_max - col_min
+        
+        # 所有列一次性计算；如果某列全为同一值，则该列归一化为0
+        normalized = np.divide(
+            data - col_min,
+            col_range,
+            out=np.zeros(data.shape, dtype=np.result_type(data.dtype, np.float32)),
+            where=~(col_range < self.epsilon),
+        )
         
         self.normalized_data = normalized
         return normalized
@@ -88,33 +125,55 @@ class HeatIndexCalculator:
         Returns:
             权重向量 (n_features,)
         """
-        # 标准化数据
-        normalized = self.normalize_data(data)
-        n_samples, n_features = normalized.shape
-        
-        # 计算各指标权重
-        weights_matrix = np.zeros_like(normalized)
-        for j in range(n_features):
-            col_sum = np.sum(normalized[:, j])
-            if col_sum < self.epsilon:
-                weights_matrix[:, j] = 1 / n_samples
-            else:
-                weights_matrix[:, j] = normalized[:, j] / col_sum
+        return self.entropy_weights_from_normalized(self.normalize_data(data))
+    
+    def entropy_weights_from_normalized(self, normalized: np.ndarray) -> np.ndarray:
+        """
+        根据已标准化的数据计算熵权（步骤同 calculate_entropy_weights 的 2-4 步）
         
-        # 计算信息熵
-        entropy = np.zeros(n_features)
-        for j in range(n_features):
-            for i in range(n_samples):
-                p_ij = weights_matrix[i, j]
-                if p_ij > self.epsilon:
-                    entropy[j] -= p_ij * np.log(p_ij)
+        Args:
+            normalized: 标准化后的数据矩阵 (n_samples, n_features)
+            
+        Returns:
+            权重向量 (n_features,)
+        """
+        n_samples = normalized.shape[0]
         
-        # 熵值标准化 (除以ln(n))
-        entropy = entropy / np.log(n_samples)
+        # 计算各指标权重（列和为0的指标视为均匀分布）
+        col_sum = np.sum(normalized, axis=0)
+        weights_matrix = self.get_buffer(
+            'weights_matrix', normalized.shape, normalized.dtype
+        )
+        weights_matrix.fill(1 / n_samples)
+        np.divide(
+            normalized,
+            col_sum,
+            out=weights_matrix,
+            where=~(col_sum < self.epsilon),
+        )
+        
+        # 计算信息熵（p_ij 过小的项按 0 * ln0 = 0 处理）
+        valid = weights_matrix > self.epsilon
+        p_log_p = self.get_buffer('p_log_p', normalized.shape, normalized.dtype)
+        p_log_p.fill(0)
+        np.log(weights_matrix, out=p_log_p, where=valid)
+        np.multiply(weights_matrix, p_log_p, out=p_log_p, where=valid)
+        entropy = -np.sum(p_log_p, axis=0)
+        
+        # 熵值标准化 (除以ln(n)，预先求倒数后改为乘法；单个样本时熵无定义)
+        inv_log_n = 1.0 / math.log(n_samples) if n_samples > 1 else math.nan
+        entropy *= inv_log_n
         
         # 计算权重：差异度 = 1 - 信息熵
-        divergence = 1 - entropy
-        weights = divergence / np.sum(divergence)
+        # 熵值在数学上不超过1，截断单精度舍入误差带来的负差异度
+        divergence = np.maximum(1 - entropy, 0)
+        divergence_sum = np.sum(divergence)
+        if divergence_sum < self.epsilon:
+            # 所有指标均无差异（如各列均为常数）时退化为等权重
+            n_features = normalized.shape[1]
+            weights = np.full(n_features, 1 / n_features, dtype=np.float32)
+        else:
+            weights = divergence / divergence_sum
         
         self.weights = weights
         return weights
@@ -136,12 +195,28 @@ class HeatIndexCalculator:
         Returns:
             相对贴近度向量 (n_samples,) - 范围[0, 1]
         """
-        # 标准化数据
-        normalized = self.normalize_data(data)
+        return self.topsis_from_normalized(self.normalize_data(data), weights)
+    
+    def topsis_from_normalized(self,
+                               normalized: np.ndarray,
+                               weights: np.ndarray) -> np.ndarray:
+        """
+        根据已标准化的数据计算 TOPSIS 相对贴近度
+        
+        Args:
+            normalized: 标准化后的数据矩阵 (n_samples, n_features)
+            weights: 权重向量 (n_features,)
+            
+        Returns:
+            相对贴近度向量 (n_samples,) - 范围[0, 1]
+        """
         n_samples = normalized.shape[0]
         
         # 加权标准化矩阵
-        weighted_normalized = normalized * weights
+        weighted_normalized = self.get_buffer(
+            'weighted_normalized', normalized.shape, np.result_type(normalized, weights)
+        )
+        np.multiply(normalized, weights, out=weighted_normalized)
         
         # 确定理想方案和负理想方案
         ideal_solution = np.max(weighted_normalized, axis=0)
@@ -150,19 +225,27 @@ class HeatIndexCalculator:
         self.ideal_solution = ideal_solution
         self.negative_ideal_solution = negative_ideal_solution
         
+        # 两次距离计算复用同一个差值缓冲区
+        diff = self.get_buffer(
+            'diff', weighted_normalized.shape, weighted_normalized.dtype
+        )
+        
         # 计算到理想方案的距离 (D+)
-        d_plus = np.sqrt(np.sum((weighted_normalized - ideal_solution) ** 2, axis=1))
+        np.subtract(weighted_normalized, ideal_solution, out=diff)
+        d_plus = np.linalg.norm(diff, axis=1)
         
         # 计算到负理想方案的距离 (D-)
-        d_minus = np.sqrt(np.sum((weighted_normalized - negative_ideal_solution) ** 2, axis=1))
-        
-        # 计算相对贴近度
-        scores = np.zeros(n_samples)
-        for i in range(n_samples):
-            if d_plus[i] + d_minus[i] < self.epsilon:
-                scores[i] = 0
-            else:
-                scores[i] = d_minus[i] / (d_plus[i] + d_minus[i])
+        np.subtract(weighted_normalized, negative_ideal_solution, out=diff)
+        d_minus = np.linalg.norm(diff, axis=1)
+        
+        # 计算相对贴近度（两个距离之和过小的样本记为0）
+        denom = d_plus + d_minus
+        scores = np.divide(
+            d_minus,
+            denom,
+            out=np.zeros(n_samples, dtype=denom.dtype),
+            where=~(denom < self.epsilon),
+        )
         
         return scores
     
@@ -183,21 +266,55 @@ class HeatIndexCalculator:
         Returns:
             热度指数向量 (n_samples,)
         """
+        # 只标准化一次，熵权和TOPSIS共用同一份标准化结果
+        normalized = self.normalize_data(data)
+        
         # 计算权重
-        weights = self.calculate_entropy_weights(data)
+        weights = self.entropy_weights_from_normalized(normalized)
         
         # TOPSIS评分 [0, 1]
-        scores = self.topsis_score(data, weights)
+        scores = self.topsis_from_normalized(normalized, weights)
         
         # 转换到 [0, scale]
         heat_indices = scores * scale
         
         return heat_indices, weights
     
+    def extract_metrics(self, data_list: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        从数据项列表中提取指标矩阵，缺失值和 None/NaN 记为 0
+        
+        Args:
+            data_list: 热搜数据项列表
+            
+        Returns:
+            指标矩阵 (n_samples, n_features)
+        """
+        if all(isinstance(item, dict) for item in data_list):
+            # 按列整体提取并转换类型，避免逐个单元格调用 float()
+            frame = pd.DataFrame.from_records(data_list, columns=self.metrics)
+            return frame.astype(np.float32).fillna(0.0).to_numpy()
+        
+        # 数据项不是字典时逐行提取
+        metrics_data = []
+        for item in data_list:
+            row = []
+            for metric in self.metrics:
+                value = item.get(metric, 0.0)
+                # 处理缺失值
+                if value is None or (isinstance(value, float) and np.isnan(value)):
+                    value = 0.0
+                row.append(float(value))
+            metrics_data.append(row)
+        
+        return np.array(metrics_data, dtype=np.float32)
+    
     def process_json_file(self, 
                          file_path: Union[str, Path],
                          output_path: Union[str, Path] = None,
-                         scale: int = 100) -> Dict[str, Any]:
+                         scale: int = 100,
+                         include_normalized: bool = False,
+                         return_data: bool = False) -> Dict[str, Any]:
         """
         处理JSON数据文件，添加热度指数
         
@@ -205,6 +322,9 @@ class HeatIndexCalculator:
             file_path: 输入JSON文件路径
             output_path: 输出JSON文件路径，如果为None则覆盖原文件
             scale: 热度指数的最大值
+            include_normalized: 是否为每条数据写入标准化后的指标（调试用）
+            return_data: 是否在结果中附带已写入热度指数的数据列表（键为"data"），
+                         便于调用方直接使用而无需重新读取输出文件
             
         Returns:
             包含处理结果的字典
@@ -216,8 +336,8 @@ class HeatIndexCalculator:
         
         try:
             # 读取JSON文件
-            with open(file_path, 'r', encoding='utf-8') as f:
-                json_data = json.load(f)
+            with open(file_path, 'rb') as f:
+                json_data = json_loads(f.read())
             
             # 提取data列表
             if isinstance(json_data, dict) and 'data' in json_data:
@@ -231,32 +351,22 @@ class HeatIndexCalculator:
                 return {"success": False, "error": "数据为空"}
             
             # 提取指标值
-            metrics_data = []
-            for item in data_list:
-                row = []
-                for metric in self.metrics:
-                    value = item.get(metric, 0.0)
-                    # 处理缺失值
-                    if value is None or (isinstance(value, float) and np.isnan(value)):
-                        value = 0.0
-                    row.append(float(value))
-                metrics_data.append(row)
-            
-            metrics_array = np.array(metrics_data, dtype=float)
+            metrics_array = self.extract_metrics(data_list)
             
             # 计算热度指数
             heat_indices, weights = self.calculate_heat_index(metrics_array, scale)
             
-            # 标准化后的数据（用于调试）
-            normalized_data = self.normalize_data(metrics_array)
-            
             # 添加热度指数到原始数据
-            for i, item in enumerate(data_list):
-                item['heat_index'] = round(float(heat_indices[i]), 2)
-                item['normalized_metrics'] = {
-                    metric: round(float(normalized_data[i, j]), 4)
-                    for j, metric in enumerate(self.metrics)
-                }
+            for item, heat_index in zip(data_list, heat_indices.tolist()):
+                item['heat_index'] = round(heat_index, 2)
+            
+            if include_normalized:
+                # 标准化后的数据（用于调试，直接复用计算热度指数时的结果，整体取整一次）
+                normalized_rows = np.round(
+                    self.normalized_data.astype(np.float64), 4
+                ).tolist()
+                for item, row in zip(data_list, normalized_rows):
+                    item['normalized_metrics'] = dict(zip(self.metrics, row))
             
             # 构建输出JSON
             if isinstance(json_data, dict):
@@ -276,10 +386,10 @@ class HeatIndexCalculator:
             
             output_path.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(json_data, f, ensure_ascii=False, indent=2)
+            with open(output_path, 'wb') as f:
+                f.write(json_dumps(json_data))
             
-            return {
+            result = {
                 "success": True,
                 "file": str(output_path),
                 "total_records": len(data_list),
@@ -295,6 +405,9 @@ class HeatIndexCalculator:
                     "std": round(float(np.std(heat_indices)), 2)
                 }
             }
+            if return_data:
+                result["data"] = data_list
+            return result
         
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -302,14 +415,16 @@ class HeatIndexCalculator:
     def process_directory(self,
                          dir_path: Union[str, Path],
                          output_dir: Union[str, Path] = None,
-                         scale: int = 100) -> List[Dict[str, Any]]:
+                         scale: int = 100,
+                         max_workers: int = None) -> List[Dict[str, Any]]:
         """
-        批量处理目录下的所有JSON文件
+        批量处理目录下的所有JSON文件（各文件互不依赖，使用多进程并行处理）
         
         Args:
             dir_path: 输入目录路径
             output_dir: 输出目录路径，如果为None则覆盖原文件
             scale: 热度指数的最大值
+            max_workers: 最大进程数，默认为CPU核数；为1时在当前进程中顺序处理
             
         Returns:
             处理结果列表
@@ -319,19 +434,62 @@ class HeatIndexCalculator:
         if not dir_path.exists():
             return [{"success": False, "error": f"目录不存在: {dir_path}"}]
         
-        results = []
-        json_files = list(dir_path.rglob("*.json"))
-        
-        if not json_files:
+        # 输出目录位于输入目录内时，遍历中途写出的文件不应再被处理
+        output_parts = None
+        if output_dir is not None:
+            try:
+                output_parts = (
+                    Path(output_dir).resolve().relative_to(dir_path.resolve()).parts
+                )
+            except ValueError:
+                output_parts = None
+        
+        def iter_jobs():
+            # 惰性遍历目录，边发现文件边处理，无需先收集完整文件列表
+            for json_file in dir_path.rglob("*.json"):
+                relative_path = json_file.relative_to(dir_path)
+                if output_parts and (
+                    relative_path.parts[:len(output_parts)] == output_parts
+                ):
+                    continue
+                if output_dir is None:
+                    yield json_file, json_file
+                else:
+                    yield json_file, Path(output_dir) / relative_path
+        
+        workers = max_workers or os.cpu_count() or 1
+        
+        # 先取出至多 workers 个文件：文件数少于进程数时按文件数缩小进程池，
+        # 只有一个文件时不必启动进程池；其余文件仍在遍历中惰性获取
+        jobs = iter_jobs()
+        first_jobs = list(islice(jobs, workers))
+        pool_size = min(workers, len(first_jobs))
+        jobs = chain(first_jobs, jobs)
+        
+        if pool_size <= 1:
+            file_results = [
+                (json_file, self.process_json_file(json_file, output_path, scale))
+                for json_file, output_path in jobs
+            ]
+        else:
+            # 每个进程创建独立的计算器实例，遍历目录与计算同时进行，结果按文件顺序返回
+            with ProcessPoolExecutor(max_workers=pool_size) as executor:
+                futures = [
+                    (json_file, executor.submit(
+                        process_file_worker, json_file, output_path, scale,
+                        self.metrics, self.epsilon,
+                    ))
+                    for json_file, output_path in jobs
+                ]
+                file_results = [
+                    (json_file, future.result()) for json_file, future in futures
+                ]
+        
+        if not file_results:
             return [{"success": False, "error": f"目录中没有JSON文件: {dir_path}"}]
         
-        for json_file in json_files:
-            if output_dir is None:
-                output_path = json_file
-            else:
-                output_path = Path(output_dir) / json_file.relative_to(dir_path)
-            
-            result = self.process_json_file(json_file, output_path, scale)
+        results = []
+        for json_file, result in file_results:
             results.append({
                 "file": str(json_file),
                 "result": result
@@ -340,6 +498,28 @@ class HeatIndexCalculator:
         return results
 
 
+def process_file_worker(file_path: Path,
+                        output_path: Path,
+                        scale: int,
+                        metrics: List[str],
+                        epsilon: float) -> Dict[str, Any]:
+    """
+    在子进程中处理单个JSON文件（供 process_directory 并行调用）
+    
+    Args:
+        file_path: 输入JSON文件路径
+        output_path: 输出JSON文件路径
+        scale: 热度指数的最大值
+        metrics: 使用的指标列表
+        epsilon: 防止除以零的小数值
+        
+    Returns:
+        process_json_file 的处理结果
+    """
+    calculator = HeatIndexCalculator(metrics=metrics, epsilon=epsilon)
+    return calculator.process_json_file(file_path, output_path, scale)
+
+
 def main():
     """示例使用"""
     import sys
@@ -351,23 +531,13 @@ def main():
     file_path = "data_processed/2024-05/2024-05-20.json"
     
     # 先读取数据，用于详细分析
-    with open(file_path, 'r', encoding='utf-8') as f:
-        json_data = json.load(f)
+    with open(file_path, 'rb') as f:
+        json_data = json_loads(f.read())
     
     data_list = json_data['data'] if isinstance(json_data, dict) else json_data
     
     # 提取指标值
-    metrics_data = []
-    for item in data_list:
-        row = []
-        for metric in calculator.metrics:
-            value = item.get(metric, 0.0)
-            if value is None or (isinstance(value, float) and np.isnan(value)):
-                value = 0.0
-            row.append(float(value))
-        metrics_data.append(row)
-    
-    metrics_array = np.array(metrics_data, dtype=float)
+    metrics_array = calculator.extract_metrics(data_list)
     
     # 显示原始数据统计
     print("=" * 80)
@@ -402,23 +572,21 @@ def main():
     print(f"指标数量: {len(calculator.metrics)}")
     
     # 重新计算以展示中间步骤
-    weights_matrix = np.zeros_like(normalized)
-    for j in range(len(calculator.metrics)):
-        col_sum = np.sum(normalized[:, j])
-        if col_sum < calculator.epsilon:
-            weights_matrix[:, j] = 1 / n_samples
-        else:
-            weights_matrix[:, j] = normalized[:, j] / col_sum
+    col_sum = np.sum(normalized, axis=0)
+    weights_matrix = np.divide(
+        normalized,
+        col_sum,
+        out=np.full_like(normalized, 1 / n_samples),
+        where=~(col_sum < calculator.epsilon),
+    )
     
-    entropy = np.zeros(len(calculator.metrics))
-    for j in range(len(calculator.metrics)):
-        for i in range(n_samples):
-            p_ij = weights_matrix[i, j]
-            if p_ij > calculator.epsilon:
-                entropy[j] -= p_ij * np.log(p_ij)
+    valid = weights_matrix > calculator.epsilon
+    p_log_p = np.log(weights_matrix, out=np.zeros_like(weights_matrix), where=valid)
+    np.multiply(weights_matrix, p_log_p, out=p_log_p, where=valid)
+    entropy = -np.sum(p_log_p, axis=0)
     
-    entropy = entropy / np.log(n_samples)
-    divergence = 1 - entropy
+    entropy *= 1.0 / math.log(n_samples) if n_samples > 1 else math.nan
+    divergence = np.maximum(1 - entropy, 0)
     
     print(f"\n{'指标':<15} {'信息熵':<15} {'差异度':<15} {'权重':<15} {'权重占比':<15}")
     print("-" * 80)
@@ -428,7 +596,7 @@ def main():
     print(f"\n权重总和验证: {np.sum(weights):.4f} (应为 1.0000)")
     
     # 处理文件
-    result = calculator.process_json_file(file_path)
+    result = calculator.process_json_file(file_path, return_data=True)
     
     print("\n" + "=" * 80)
     print("热度指数计算结果")
@@ -448,18 +616,19 @@ def main():
     
     # 示例2：显示前10条记录的热度指数
     if result['success']:
-        with open(result['file'], 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
         print(f"\n热度指数 Top 10:")
         print("-" * 100)
         print(f"{'排名':<5} {'标题':<45} {'热度指数':<12} {'原始热度':<12} {'阅读':<10} {'讨论':<10}")
         print("-" * 100)
         
-        data_list = data['data'] if isinstance(data, dict) else data
-        sorted_data = sorted(data_list, key=lambda x: x.get('heat_index', 0), reverse=True)[:10]
+        data_list = result['data']
+        # 部分排序只取前10个，再对这10个按热度指数降序（同分按原顺序）排列
+        heat_indices = np.array([x.get('heat_index', 0) for x in data_list], dtype=float)
+        top_k = min(10, len(heat_indices))
+        top_idx = np.argpartition(-heat_indices, top_k - 1)[:top_k]
+        top_idx = top_idx[np.lexsort((top_idx, -heat_indices[top_idx]))]
         
-        for i, item in enumerate(sorted_data, 1):
+        for i, item in enumerate((data_list[j] for j in top_idx), 1):
             title = item.get('title', 'N/A')[:40]
             heat_idx = item.get('heat_index', 0)
             heat = item.get('heat', 0)
@@ -11,7 +11,7 @@ JSON 数据分析模块
 4. 其他格式：包含 data 字段的其他格式
 
 函数说明：
-- analyze_json(json_file_path): 主函数，读取 JSON 文件并进行分析和图表生成
+- analyze_json(json_file_path): 主函数，读取 JSON 文件（或字节串/文件对象）并进行分析和图表生成
 - analyze_data(data): 通用分析函数，支持多种数据输入格式
 - load_and_normalize_data(json_file_path): 加载并规范化 JSON 数据
 
@@ -29,8 +29,9 @@ import json
 import os
 import platform
 import warnings
+from collections import Counter
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import IO, Any, Dict, List, Optional, Union
 
 import matplotlib
 import matplotlib.font_manager as fm
@@ -38,6 +39,12 @@ import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
+# 优先使用 orjson 解析 JSON，未安装时回退到标准库
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # 导入情感分析模块
 try:
     from src.sentiment_analyzer import SentimentAnalyzer
@@ -55,6 +62,9 @@ warnings.filterwarnings("ignore", category=FutureWarning)
 # 全局字体属性，后续直接使用
 GLOBAL_FONT_PROP = None
 
+# 基本分析中需要统计的数值字段
+ANALYSIS_NUMERIC_FIELDS = ("heat", "reads", "discussions")
+
 
 def sanitize_for_matplotlib(text: str) -> str:
     """移除 Matplotlib 通常无法正常显示的字符（如彩色 Emoji/非常用符号）。
@@ -126,6 +136,13 @@ def setup_font(font_name: str = "") -> bool:
         return False
 
 
+def json_loads_bytes(data: Union[bytes, bytearray]) -> Any:
+    """解析 JSON 字节串（优先使用 orjson）"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 def load_json_data(file_path: str) -> Dict[str, Any]:
     """
     加载 JSON 数据文件
@@ -143,8 +160,9 @@ def load_json_data(file_path: str) -> Dict[str, Any]:
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"文件不存在: {file_path}")
 
-    with open(file_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    # 以二进制读取后直接解析，省去文本解码这一步
+    with open(file_path, "rb") as f:
+        data = json_loads_bytes(f.read())
 
     return data
 
@@ -188,7 +206,7 @@ def analyze_data(
     通用数据分析和图表生成函数
 
     Args:
-        data: 输入数据，可以是文件路径、字典或列表
+        data: 输入数据，可以是文件路径、JSON 字节串、二进制文件对象、字典或列表
         output_dir_name: 可选的输出目录名称，默认使用数据中的日期
         json_file_path: 可选的原始JSON文件路径，用于确定输出目录名称
 
@@ -210,6 +228,12 @@ def analyze_data(
 
     try:
         # 2. 处理输入数据
+        # 字节串或文件对象直接在内存中解析，无需先写入临时文件
+        if isinstance(data, (bytes, bytearray)):
+            data = json_loads_bytes(data)
+        elif hasattr(data, "read"):
+            data = json_loads_bytes(data.read())
+
         if isinstance(data, str):
             # 文件路径
             normalized_data = load_and_normalize_data(data)
@@ -375,6 +399,77 @@ def normalize_data(data: Dict[str, Any]) -> Dict[str, Any]:
     )
 
 
+def extract_columns(
+    items: List[Dict[str, Any]], fields=ANALYSIS_NUMERIC_FIELDS
+) -> Dict[str, np.ndarray]:
+    """
+    从数据项中按字段投影出数值列
+
+    只读取所需字段并直接写入 NumPy 数组，不为数据项的全部字段构建 DataFrame。
+
+    Args:
+        items: 数据项列表
+        fields: 需要提取的数值字段
+
+    Returns:
+        Dict[str, np.ndarray]: 字段名到 float64 数组的映射，缺失值记为 NaN；
+            所有数据项都不包含的字段不会出现在结果中
+    """
+    columns = {}
+    for field in fields:
+        if not any(field in item for item in items):
+            continue
+        values = (item.get(field) for item in items)
+        columns[field] = np.fromiter(
+            (np.nan if value is None else value for value in values),
+            dtype=np.float64,
+            count=len(items),
+        )
+    return columns
+
+
+def column_stats(values: np.ndarray) -> Dict[str, float]:
+    """
+    计算数值列的汇总统计量（忽略 NaN）
+
+    中位数使用 np.partition 选取中间元素，无需完整排序。
+
+    Args:
+        values: float64 数值列
+
+    Returns:
+        Dict[str, float]: 包含 mean, median, max, min, std（样本标准差）, total
+    """
+    values = values[~np.isnan(values)]
+    n = values.size
+    if n == 0:
+        stats = dict.fromkeys(("mean", "median", "max", "min", "std"), float("nan"))
+        stats["total"] = 0.0
+        return stats
+
+    total = float(np.add.reduce(values))
+    mean = total / n
+    deviations = values - mean
+    std = (
+        float(np.sqrt(np.dot(deviations, deviations) / (n - 1)))
+        if n > 1
+        else float("nan")
+    )
+
+    lo, hi = (n - 1) // 2, n // 2
+    part = np.partition(values, [lo, hi])
+    median = float(part[hi]) if lo == hi else float(0.5 * (part[lo] + part[hi]))
+
+    return {
+        "mean": mean,
+        "median": median,
+        "max": float(values.max()),
+        "min": float(values.min()),
+        "std": std,
+        "total": total,
+    }
+
+
 def basic_analysis(data: Dict[str, Any]) -> Dict[str, Any]:
     """
     执行基本数据分析
@@ -394,8 +489,16 @@ def basic_analysis(data: Dict[str, Any]) -> Dict[str, Any]:
         print(f"警告: {date} 的数据为空")
         return {}
 
-    # 转换为 DataFrame 以便分析
-    df = pd.DataFrame(items)
+    # 只投影统计所需的数值列，统计量直接在 NumPy 数组上计算
+    columns = extract_columns(items)
+    empty_stats = dict.fromkeys(("mean", "median", "max", "min", "std", "total"), 0.0)
+    heat_stats = column_stats(columns["heat"]) if "heat" in columns else empty_stats
+    reads_stats = column_stats(columns["reads"]) if "reads" in columns else empty_stats
+    discussions_stats = (
+        column_stats(columns["discussions"])
+        if "discussions" in columns
+        else empty_stats
+    )
 
     # 基本统计信息
     analysis_result = {
@@ -403,55 +506,39 @@ def basic_analysis(data: Dict[str, Any]) -> Dict[str, Any]:
         "total_items": count,
         "actual_items": len(items),
         "heat_stats": {
-            "mean": float(df["heat"].mean())
-            if "heat" in df.columns and not df["heat"].empty
-            else 0.0,
-            "median": float(df["heat"].median())
-            if "heat" in df.columns and not df["heat"].empty
-            else 0.0,
-            "max": float(df["heat"].max())
-            if "heat" in df.columns and not df["heat"].empty
-            else 0.0,
-            "min": float(df["heat"].min()) if "heat" in df.columns else 0.0,
-            "std": float(df["heat"].std()) if "heat" in df.columns else 0.0,
+            key: heat_stats[key] for key in ("mean", "median", "max", "min", "std")
         },
         "reads_stats": {
-            "mean": float(df["reads"].mean()) if "reads" in df.columns else 0.0,
-            "median": float(df["reads"].median()) if "reads" in df.columns else 0.0,
-            "max": float(df["reads"].max()) if "reads" in df.columns else 0.0,
-            "min": float(df["reads"].min()) if "reads" in df.columns else 0.0,
-            "total": float(df["reads"].sum()) if "reads" in df.columns else 0.0,
+            key: reads_stats[key] for key in ("mean", "median", "max", "min", "total")
         },
         "discussions_stats": {
-            "mean": float(df["discussions"].mean())
-            if "discussions" in df.columns
-            else 0.0,
-            "median": float(df["discussions"].median())
-            if "discussions" in df.columns
-            else 0.0,
-            "max": float(df["discussions"].max())
-            if "discussions" in df.columns
-            else 0.0,
-            "min": float(df["discussions"].min())
-            if "discussions" in df.columns
-            else 0.0,
-            "total": float(df["discussions"].sum())
-            if "discussions" in df.columns
-            else 0.0,
+            key: discussions_stats[key]
+            for key in ("mean", "median", "max", "min", "total")
         },
         "category_distribution": {},
         "top_titles": [],
     }
 
-    # 类别分布分析
-    if "category" in df.columns:
-        category_counts = df["category"].value_counts()
-        analysis_result["category_distribution"] = category_counts.to_dict()
-
-    # 热度最高的前10个标题
-    if "title" in df.columns and "heat" in df.columns:
-        top_titles = df.nlargest(10, "heat")[["title", "heat", "rank"]]
-        analysis_result["top_titles"] = top_titles.to_dict(orient="records")
+    # 类别分布分析（按数量降序，数量相同时保持首次出现的顺序）
+    if any("category" in item for item in items):
+        category_counts = Counter(
+            item["category"] for item in items if item.get("category") is not None
+        )
+        analysis_result["category_distribution"] = dict(category_counts.most_common())
+
+    # 热度最高的前10个标题（忽略缺失热度，热度相同时保持原顺序）
+    if "heat" in columns and any("title" in item for item in items):
+        heat = columns["heat"]
+        valid = np.flatnonzero(~np.isnan(heat))
+        top_idx = valid[np.argsort(-heat[valid], kind="stable")[:10]]
+        analysis_result["top_titles"] = [
+            {
+                "title": items[i].get("title"),
+                "heat": float(heat[i]),
+                "rank": items[i].get("rank"),
+            }
+            for i in top_idx
+        ]
 
     return analysis_result
 
@@ -993,15 +1080,21 @@ def save_analysis_report(analysis_result: Dict[str, Any], output_dir: str):
     print(f"分析报告已保存到: {report_path}")
 
 
-def analyze_json(json_file_path: str, output_dir_name: Optional[str] = None):
+def analyze_json(
+    json_file_path: Union[str, bytes, IO[bytes]],
+    output_dir_name: Optional[str] = None,
+):
     """
     分析 JSON 文件并生成图表
 
     Args:
-        json_file_path: JSON 文件路径
-        output_dir_name: 可选的输出目录名称，默认使用数据中的日期
+        json_file_path: JSON 文件路径，也可以是 JSON 字节串或二进制文件对象
+        output_dir_name: 可选的输出目录名称，默认使用文件名，
+            传入字节串或文件对象时默认使用数据中的日期
     """
-    return analyze_data(json_file_path, output_dir_name, json_file_path)
+    if isinstance(json_file_path, str):
+        return analyze_data(json_file_path, output_dir_name, json_file_path)
+    return analyze_data(json_file_path, output_dir_name)
 
 
 def analyze_dict_data(data_dict: Dict[str, Any], output_dir_name: Optional[str] = None):
@@ -0,0 +1,38 @@
+"""
+热度指数计算器回归测试
+"""
+
+import json
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.heat_index_calculator import HeatIndexCalculator
+
+
+def test_all_constant_metrics_fall_back_to_equal_weights(tmp_path):
+    """所有指标列均为常数时应得到等权重，热度指数为 0 而不是 NaN"""
+    input_path = tmp_path / 'constant.json'
+    output_path = tmp_path / 'constant_out.json'
+    records = [
+        {'title': f'话题{i}', 'heat': 0, 'reads': 0, 'discussions': 0, 'originals': 0}
+        for i in range(5)
+    ]
+    input_path.write_text(
+        json.dumps({'date': '2024-05-20', 'count': len(records), 'data': records}),
+        encoding='utf-8',
+    )
+
+    result = HeatIndexCalculator().process_json_file(input_path, output_path)
+
+    assert result['success']
+    assert result['entropy_weights'] == {
+        'heat': 0.25, 'reads': 0.25, 'discussions': 0.25, 'originals': 0.25
+    }
+    assert all(value == 0.0 for value in result['heat_index_stats'].values())
+
+    data = json.loads(output_path.read_text(encoding='utf-8'))['data']
+    assert [item['heat_index'] for item in data] == [0.0] * len(records)